@@ -0,0 +1,165 @@
+import argparse
+import math
+import time
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple
+from config import Config
+from contour_tracking import FINGER_ANGLES, ContourHandTracker
+from frame_result import Gesture
+from gesture_rec import GestureRecognizer
+
+TIPS = [4, 8, 12, 16, 20]
+PALM = [0, 5, 9, 13, 17]
+MATCH_WINDOW = 0.2  # seconds; gestures this close in time count as the same decision
+SKIN_BGR = (120, 150, 200)  # YCrCb (162, 155, 104), inside the default skin range
+# Finger-less blobs (center, half-axes) on a 1280x720 frame: a face, a fist, a large close fist
+FINGERLESS_BLOBS = [((640, 360), (100, 130)), ((640, 420), (90, 90)), ((640, 400), (160, 170))]
+
+def load_clip(path: str, max_frames: Optional[int]) -> Tuple[List[np.ndarray], float]:
+    """Decode the whole clip up front so the benchmark measures tracking, not video decoding"""
+    capture = cv2.VideoCapture(path)
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = []
+    while max_frames is None or len(frames) < max_frames:
+        success, frame = capture.read()
+        if not success:
+            break
+        frames.append(cv2.flip(frame, 1))  # Same orientation as the live loop
+    capture.release()
+    return frames, fps
+
+def run_tracker(tracker, frames: List[np.ndarray]) -> Tuple[List[Optional[np.ndarray]], float]:
+    results = []
+    start = time.perf_counter()
+    for frame in frames:
+        _, landmarks = tracker.find_hands(frame, draw=False)
+        results.append(tracker.get_landmark_coordinates(frame, landmarks[0]) if landmarks else None)
+    elapsed = time.perf_counter() - start
+    return results, len(frames) / elapsed if elapsed > 0 else 0.0
+
+def run_gestures(landmarks: List[Optional[np.ndarray]], fps: float) -> List[Tuple[float, Gesture]]:
+    recognizer = GestureRecognizer(Config().gesture_thresholds)
+    fired = []
+    for i, coordinates in enumerate(landmarks):
+        gesture = recognizer.recognize_gesture(coordinates, i / fps)
+        if gesture:
+            fired.append((i / fps, gesture))
+    return fired
+
+def compare(reference: List[Optional[np.ndarray]], candidate: List[Optional[np.ndarray]]) -> dict:
+    agree = sum((r is None) == (c is None) for r, c in zip(reference, candidate))
+    palm_errors, tip_errors = [], []
+    for r, c in zip(reference, candidate):
+        if r is None or c is None:
+            continue
+        hand_size = max(1.0, float(np.hypot(*(r[9] - r[0]))))
+        # The contour tracker's landmark 0 is the palm center, not the wrist
+        palm = r[PALM].mean(axis=0)
+        palm_errors.append(np.hypot(*(c[0] - palm)) / hand_size)
+        tip_errors.append(np.hypot(*(c[TIPS] - r[TIPS]).T).mean() / hand_size)
+    return {
+        'detection_agreement': agree / max(1, len(reference)),
+        'palm_error': float(np.median(palm_errors)) if palm_errors else float('nan'),
+        'tip_error': float(np.median(tip_errors)) if tip_errors else float('nan'),
+    }
+
+def match_gestures(reference: List[Tuple[float, Gesture]], candidate: List[Tuple[float, Gesture]]) -> Tuple[float, float]:
+    unmatched = list(reference)
+    hits = 0
+    for t, gesture in candidate:
+        match = next((r for r in unmatched if r[1] == gesture and abs(r[0] - t) <= MATCH_WINDOW), None)
+        if match is not None:
+            unmatched.remove(match)
+            hits += 1
+    precision = hits / len(candidate) if candidate else float('nan')
+    recall = hits / len(reference) if reference else float('nan')
+    return precision, recall
+
+def draw_synthetic_hand(frame: np.ndarray, center: Tuple[int, int], radius: int, fingers: List[int]):
+    """Round palm with the given fingers (0 is the thumb) extended at their expected angles"""
+    cv2.circle(frame, center, radius, SKIN_BGR, -1)
+    for finger in fingers:
+        angle = math.radians(FINGER_ANGLES[finger])
+        length = radius * (1.6 if finger == 0 else 2.3)
+        tip = (int(center[0] + math.sin(angle) * length), int(center[1] - math.cos(angle) * length))
+        cv2.line(frame, center, tip, SKIN_BGR, int(radius * 0.35))
+
+def run_synthetic(frame: np.ndarray, frames: int = 30) -> Tuple[int, np.ndarray, List[Gesture]]:
+    """Track a static frame and recognize on landmarks[0] like the live loop; return hands, scores, fired"""
+    config = Config()
+    tracker = ContourHandTracker(config.tracker_settings)
+    recognizer = GestureRecognizer(config.gesture_thresholds)
+    hands, fired = 0, []
+    for i in range(frames):
+        _, landmarks = tracker.find_hands(frame, draw=False, timestamp=i / 30)
+        hands = len(landmarks)
+        coordinates = tracker.get_landmark_coordinates(frame, landmarks[0]) if landmarks else None
+        gesture = recognizer.recognize_gesture(coordinates, i / 30)
+        if gesture:
+            fired.append(gesture)
+    return hands, recognizer.scores.copy(), fired
+
+def check_fingerless_blobs() -> bool:
+    """Regression check: skin blobs with no extended fingers are not hands and score nothing"""
+    passed = True
+    for center, axes in FINGERLESS_BLOBS:
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        cv2.ellipse(frame, center, axes, 0, 0, 360, SKIN_BGR, -1)
+        hands, scores, fired = run_synthetic(frame)
+        if hands or scores.any() or fired:
+            print(f"Blob {axes}: {hands} hands, scores {np.round(scores, 2).tolist()}, "
+                  f"fired {[g.label for g in fired]}")
+            passed = False
+
+    # A face beside the hand must not take landmarks[0]; the face is left of the hand here
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    cv2.ellipse(frame, (500, 250), (100, 130), 0, 0, 360, SKIN_BGR, -1)
+    draw_synthetic_hand(frame, (900, 450), 90, [2])
+    hands, scores, fired = run_synthetic(frame)
+    if Gesture.VOLUME_UP not in fired:
+        print(f"Face and hand: {hands} hands, scores {np.round(scores, 2).tolist()}, "
+              f"fired {[g.label for g in fired]}, expected volume_up")
+        passed = False
+
+    print(f"Finger-less blob check {'passed' if passed else 'FAILED'}")
+    return passed
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the contour tracker against MediaPipe on recorded clips")
+    parser.add_argument('clips', nargs='*', help="Video files recorded from the kiosk camera")
+    parser.add_argument('--max-frames', type=int, default=None)
+    parser.add_argument('--process-width', type=int, default=None, help="Override the contour backend's processing width")
+    parser.add_argument('--check', action='store_true', help="Run the synthetic regression checks, then exit")
+    args = parser.parse_args()
+
+    if args.check:
+        raise SystemExit(0 if check_fingerless_blobs() else 1)
+    if not args.clips:
+        parser.error("no clips given")
+
+    from hand_tracking import HandTracker
+    settings = Config().tracker_settings
+    if args.process_width:
+        settings.process_width = args.process_width
+
+    for path in args.clips:
+        frames, fps = load_clip(path, args.max_frames)
+        if not frames:
+            print(f"{path}: no frames")
+            continue
+
+        reference, mediapipe_fps = run_tracker(
+            HandTracker(settings.max_hands, settings.detection_confidence, settings.tracking_confidence), frames)
+        candidate, contour_fps = run_tracker(ContourHandTracker(settings), frames)
+        accuracy = compare(reference, candidate)
+        precision, recall = match_gestures(run_gestures(reference, fps), run_gestures(candidate, fps))
+
+        print(f"{path}: {len(frames)} frames")
+        print(f"  throughput   mediapipe {mediapipe_fps:7.1f} fps   contour {contour_fps:7.1f} fps")
+        print(f"  detection agreement {accuracy['detection_agreement']:.1%}")
+        print(f"  median error (hand sizes)  palm {accuracy['palm_error']:.2f}  fingertips {accuracy['tip_error']:.2f}")
+        print(f"  gestures vs mediapipe  precision {precision:.1%}  recall {recall:.1%}")
+
+if __name__ == "__main__":
+    main()
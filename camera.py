@@ -0,0 +1,169 @@
+import cv2
+import numpy as np
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+from config import CameraSettings
+
+class CameraCapture:
+    def __init__(self, settings: CameraSettings):
+        self.settings = settings
+        self.cap = None
+        self.negotiated: Dict[str, object] = {}
+        self._frame_ready = threading.Condition()
+        self._frame: Optional[np.ndarray] = None
+        self._frame_id = 0
+        self._frame_time = 0.0
+        self._last_read_id = 0
+        self._last_read_time = 0.0
+        self._frame_times = deque(maxlen=60)
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def open(self) -> bool:
+        try:
+            self.cap = cv2.VideoCapture(self.settings.camera_id)
+            if not self.cap.isOpened():
+                raise Exception("Failed to open camera")
+
+            self._negotiate()
+            self._report()
+
+            self._running = True
+            self._thread = threading.Thread(target=self._grab_loop, name='camera-grabber', daemon=True)
+            self._thread.start()
+            return True
+        except Exception as e:
+            print(f"Error opening camera: {str(e)}")
+            self.release()
+            return False
+
+    def _negotiate(self):
+        """Try the requested mode first, then the fallbacks, keeping the first one that reaches min_fps"""
+        candidates = [(self.settings.width, self.settings.height)] + list(self.settings.fallback_resolutions)
+        best = None
+        for width, height in candidates:
+            mode = self._apply_mode(width, height)
+            if best is None or mode['measured_fps'] > best['measured_fps']:
+                best = mode
+            if mode['measured_fps'] >= self.settings.min_fps:
+                self.negotiated = mode
+                return
+
+        # Nothing reached min_fps; fall back to the fastest mode we saw
+        if best is not None and best is not mode:
+            best = self._apply_mode(best['requested'][0], best['requested'][1])
+        self.negotiated = best or {}
+
+    def _apply_mode(self, width: int, height: int) -> Dict[str, object]:
+        # FOURCC has to be set before the resolution, otherwise V4L2 drivers
+        # pick the frame size against the previous (usually YUYV) format.
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.settings.fourcc))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.cap.set(cv2.CAP_PROP_FPS, self.settings.fps)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.settings.buffer_size)
+
+        return {
+            'requested': (width, height),
+            'fourcc': self._decode_fourcc(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'reported_fps': self.cap.get(cv2.CAP_PROP_FPS),
+            'buffer_size': int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+            'measured_fps': self._measure_fps(),
+        }
+
+    def _measure_fps(self) -> float:
+        """Time a few grabs, since many drivers report the requested FPS rather than the real one"""
+        # The first grab after a mode change includes stream start-up, so it is not timed
+        if not self.cap.grab():
+            return 0.0
+        start = time.perf_counter()
+        grabbed = 0
+        for _ in range(self.settings.probe_frames):
+            if self.cap.grab():
+                grabbed += 1
+        elapsed = time.perf_counter() - start
+        return grabbed / elapsed if elapsed > 0 else 0.0
+
+    @staticmethod
+    def _decode_fourcc(value: float) -> str:
+        code = int(value)
+        return ''.join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+    def _report(self):
+        mode = self.negotiated
+        print(f"Camera negotiated {mode.get('width')}x{mode.get('height')} "
+              f"{mode.get('fourcc')} @ {mode.get('measured_fps', 0.0):.1f} fps "
+              f"(driver reports {mode.get('reported_fps', 0.0):.1f}, buffer {mode.get('buffer_size')})")
+        if mode.get('fourcc') != self.settings.fourcc:
+            print(f"Warning: camera did not accept {self.settings.fourcc}, using {mode.get('fourcc')}")
+
+    def _grab_loop(self):
+        # grab() drains the driver queue as fast as frames arrive, so the frame
+        # handed to the main loop is never older than one capture interval.
+        while self._running:
+            if not self.cap.grab():
+                time.sleep(0.005)
+                continue
+            success, frame = self.cap.retrieve()
+            if not success:
+                continue
+
+            now = time.monotonic()
+            with self._frame_ready:
+                self._frame = frame
+                self._frame_id += 1
+                self._frame_time = now
+                self._frame_times.append(now)
+                self._frame_ready.notify_all()
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Return the freshest frame, waiting for one newer than the last frame returned"""
+        with self._frame_ready:
+            if not self._frame_ready.wait_for(lambda: self._frame_id > self._last_read_id or not self._running,
+                                              timeout=self.settings.read_timeout):
+                return False, None
+            if self._frame is None:
+                return False, None
+            self._last_read_id = self._frame_id
+            self._last_read_time = self._frame_time
+            return True, self._frame
+
+    @property
+    def frame_id(self) -> int:
+        return self._last_read_id
+
+    @property
+    def frame_time(self) -> float:
+        """Monotonic capture time of the frame last returned by read()"""
+        return self._last_read_time
+
+    @property
+    def frame_age(self) -> float:
+        """Seconds since the frame last returned by read() was captured"""
+        with self._frame_ready:
+            if self._last_read_time == 0.0:
+                return float('inf')
+            return time.monotonic() - self._last_read_time
+
+    @property
+    def capture_fps(self) -> float:
+        with self._frame_ready:
+            if len(self._frame_times) < 2:
+                return 0.0
+            span = self._frame_times[-1] - self._frame_times[0]
+            return (len(self._frame_times) - 1) / span if span > 0 else 0.0
+
+    def release(self):
+        self._running = False
+        with self._frame_ready:
+            self._frame_ready.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
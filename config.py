@@ -1,13 +1,80 @@
 from dataclasses import dataclass
 import numpy as np
 from typing import Dict, List, Tuple
+from frame_result import Gesture
+
+@dataclass
+class TrackerSettings:
+    backend: str = 'mediapipe'  # 'mediapipe', or 'contour' for CPU-starved machines
+    max_hands: int = 2
+    detection_confidence: float = 0.5
+    tracking_confidence: float = 0.5
+    # Contour backend only
+    process_width: int = 320  # Frames are downscaled to this width before segmentation
+    skin_lower: Tuple[int, int, int] = (0, 133, 77)  # YCrCb
+    skin_upper: Tuple[int, int, int] = (255, 173, 127)
+    min_area_ratio: float = 0.02  # Smallest blob, as a fraction of the frame, accepted as a hand
+    smoothing: float = 0.5  # Weight of the previous frame's landmarks (0 disables smoothing)
 
 @dataclass
 class GestureThresholds:
     pinch_distance: int = 40
-    swipe_distance: int = 50
+    swipe_distance: int = 150  # pixels travelled per motion_window_ms, about 1500 px/s
     vertical_gesture_distance: int = 100
-    rotation_angle: int = 30
+    rotation_angle: int = 90  # degrees turned per motion_window_ms, about 900 deg/s
+    motion_window_ms: float = 100.0
+    score_softness: float = 0.25  # Half-width of the score ramp, as a fraction of each threshold
+    score_margin: float = 0.1  # Ordering margin, as a fraction of hand size (wrist to middle knuckle)
+    enter_confidence: float = 0.7
+    exit_confidence: float = 0.4
+    candidate_ms: float = 50.0  # Score must hold above enter_confidence this long before firing
+    release_ms: float = 150.0  # Score must stay below exit_confidence this long to re-arm
+    repeat_ms: float = 250.0  # Repeat interval for held volume/brightness gestures
+
+@dataclass
+class CameraSettings:
+    camera_id: int = 0
+    width: int = 1920
+    height: int = 1080
+    fps: int = 30
+    fourcc: str = 'MJPG'  # Compressed mode keeps USB bandwidth low at high resolutions
+    buffer_size: int = 1  # Driver-side queue length; 1 avoids serving stale frames
+    fallback_resolutions: List[Tuple[int, int]] = None
+    min_fps: float = 15.0  # Accept the first mode that reaches this rate during probing
+    probe_frames: int = 10  # Frames grabbed per mode when measuring the real rate
+    read_timeout: float = 1.0  # seconds
+
+    def __post_init__(self):
+        if self.fallback_resolutions is None:
+            self.fallback_resolutions = [(1280, 720), (640, 480)]
+
+@dataclass
+class MotionSettings:
+    enabled: bool = True
+    downsample_size: Tuple[int, int] = (64, 48)  # Grayscale image used for frame differencing
+    pixel_threshold: int = 20  # Minimum per-pixel intensity change counted as motion
+    motion_threshold: float = 0.01  # Fraction of changed pixels that counts as motion
+    idle_timeout: float = 5.0  # seconds without motion or a tracked hand before idling
+    idle_fps: float = 5.0
+
+@dataclass
+class EventSettings:
+    enabled: bool = False  # Stream gestures to other local apps
+    host: str = '127.0.0.1'
+    port: int = 8765
+    stream_landmarks: bool = True  # Allow clients to request per-frame landmarks
+    max_queue: int = 64  # Messages buffered per client before drop_policy applies
+    drop_policy: str = 'drop_oldest'  # 'drop_oldest', 'drop_newest' or 'disconnect'
+    send_timeout: float = 2.0  # seconds; a client stuck longer than this is disconnected
+
+@dataclass
+class RecorderSettings:
+    enabled: bool = False  # Record landmarks, gestures and actions for later replay
+    directory: str = 'sessions'
+    chunk_events: int = 512  # Events per compressed chunk
+    chunk_seconds: float = 2.0  # Flush a partial chunk after this long
+    compression_level: int = 6  # zlib level
+    max_queue: int = 8192  # Events buffered for the writer thread before new ones are dropped
 
 @dataclass
 class SystemControlSettings:
@@ -23,6 +90,24 @@ class AnimationSettings:
     particle_lifetime: int = 30
     hex_rotation_speed: float = 2.0
 
+@dataclass
+class GraphSettings:
+    width: int = 200
+    height: int = 100
+    fps_max: float = 60.0  # FPS plotted at the top of the graph
+    latency_max_ms: float = 100.0  # Inference latency plotted at the top of the graph
+    series_colors: Dict[str, Tuple[int, int, int]] = None
+
+    def __post_init__(self):
+        if self.series_colors is None:
+            self.series_colors = {
+                'volume': (0, 255, 100),  # Green-Cyan
+                'brightness': (255, 200, 0),  # Yellow
+                'fps': (200, 200, 200),  # Grey
+                'latency': (50, 50, 255),  # Red
+                'confidence': (200, 0, 255),  # Purple
+            }
+
 @dataclass
 class ColorScheme:
     base: Dict[str, Tuple[int, int, int]] = None
@@ -40,6 +125,10 @@ class ColorScheme:
             'rotate_clockwise': (150, 255, 150),  # Light Green
             'rotate_counterclockwise': (150, 150, 255),  # Light Blue
         }
+        # Indexed by Gesture id so the UI can look colors up without string keys
+        self.palette: List[Tuple[int, int, int]] = [
+            self.base.get(gesture.label, self.base['default']) for gesture in Gesture
+        ]
 
 @dataclass
 class UISettings:
@@ -50,22 +139,30 @@ class UISettings:
     background_overlay: tuple = (0, 0, 0, 0.4)
     font_scale: float = 0.7
     thickness: int = 2
+    unicode_font_path: str = None  # Optional TTF for non-ASCII labels (needs Pillow); arrows work without it
     show_grid: bool = True
     show_hexagons: bool = True
     show_glow: bool = True
     show_particles: bool = True
     show_data_vis: bool = True
     animation_settings: AnimationSettings = None
+    graph_settings: GraphSettings = None
     color_scheme: ColorScheme = None
 
     def __post_init__(self):
         self.animation_settings = AnimationSettings()
+        self.graph_settings = GraphSettings()
         self.color_scheme = ColorScheme()
 
 class Config:
     def __init__(self):
+        self.camera_settings = CameraSettings()
+        self.motion_settings = MotionSettings()
+        self.tracker_settings = TrackerSettings()
         self.gesture_thresholds = GestureThresholds()
         self.system_settings = SystemControlSettings()
+        self.event_settings = EventSettings()
+        self.recorder_settings = RecorderSettings()
         self.ui_settings = UISettings()
 
 
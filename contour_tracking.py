@@ -0,0 +1,246 @@
+import cv2
+import itertools
+import math
+import numpy as np
+import time
+from typing import List, Optional, Tuple
+from config import TrackerSettings
+from events import EventBus
+from frame_result import Handedness
+
+# MediaPipe landmark layout: 0 is the wrist, then four points per finger from thumb to pinky.
+# The contour tracker fills the same 21 slots so GestureRecognizer works unchanged.
+FINGER_BASES = (1, 5, 9, 13, 17)
+# Expected finger direction in degrees clockwise from straight up, for a palm facing the
+# (mirrored) camera: thumb to the left, pinky to the right.
+FINGER_ANGLES = (-75.0, -25.0, 0.0, 20.0, 40.0)
+# Where folded fingertips are placed, in palm radii from the palm center. They sit just below
+# the center so they read as folded, with the thumb well clear of the index finger so that a
+# fist is never read as a pinch; only a hole in the blob (_find_pinch_hole) makes one.
+FOLDED_OFFSETS = ((-1.2, 0.3), (0.3, 0.3), (0.5, 0.3), (0.7, 0.3), (0.9, 0.3))
+
+class ContourHand:
+    __slots__ = ('landmarks', 'hull')
+
+    def __init__(self, landmarks: np.ndarray, hull: np.ndarray):
+        self.landmarks = landmarks  # (21, 2) float32, normalized to [0, 1] like MediaPipe
+        self.hull = hull  # Convex hull in normalized coordinates, for drawing
+
+class ContourHandTracker:
+    """MediaPipe-free hand tracker using skin segmentation, contours and the convex hull.
+
+    Only the palm center, knuckles and extended fingertips are estimated, which is enough
+    for swipe, pinch and vertical gestures on machines that can't run MediaPipe at frame rate.
+    """
+    TIP_DISTANCE = 1.6  # Hull points this many palm radii from the center are fingertip candidates
+    TIP_MERGE = 0.4  # Candidates closer than this many palm radii belong to one fingertip
+    VALLEY_DEPTH = 0.3  # Convexity defects this many palm radii deep are gaps beside a finger
+    MATCH_DISTANCE = 0.15  # Palm travel between frames, as a fraction of the frame, still smoothed
+
+    def __init__(self, settings: TrackerSettings, event_bus: Optional[EventBus] = None):
+        self.settings = settings
+        self.event_bus = event_bus
+        self.timestamp = 0.0
+        self._hands: List[ContourHand] = []
+        self._previous: List[np.ndarray] = []
+        self._open_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        self._close_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (7, 7))
+        self._skin_lower = np.array(settings.skin_lower, dtype=np.uint8)
+        self._skin_upper = np.array(settings.skin_upper, dtype=np.uint8)
+
+    def find_hands(self, frame: np.ndarray, draw: bool = True,
+                   timestamp: Optional[float] = None) -> Tuple[np.ndarray, List]:
+        try:
+            self.timestamp = time.monotonic() if timestamp is None else timestamp
+            h, w = frame.shape[:2]
+            scale = min(1.0, self.settings.process_width / w)
+            small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) \
+                if scale < 1.0 else frame
+
+            hands = self._detect(small)
+            self._smooth(hands)
+            self._hands = hands
+
+            if draw:
+                for hand in hands:
+                    self._draw_hand(frame, hand)
+            if not hands and self.event_bus is not None:
+                self.event_bus.publish_landmarks(None, self.timestamp)
+
+            return frame, list(hands)
+        except Exception as e:
+            print(f"Error in hand detection: {str(e)}")
+            return frame, []
+
+    def _detect(self, small: np.ndarray) -> List[ContourHand]:
+        sh, sw = small.shape[:2]
+        ycrcb = cv2.cvtColor(small, cv2.COLOR_BGR2YCrCb)
+        mask = cv2.inRange(ycrcb, self._skin_lower, self._skin_upper)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._open_kernel)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self._close_kernel)
+
+        contours, hierarchy = cv2.findContours(mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+        if hierarchy is None:
+            return []
+        hierarchy = hierarchy[0]
+
+        min_area = self.settings.min_area_ratio * sw * sh
+        outer = [(cv2.contourArea(contours[i]), i) for i in range(len(contours)) if hierarchy[i][3] == -1]
+        outer = sorted((item for item in outer if item[0] >= min_area), reverse=True)
+
+        # A face or forearm is often as large as the hand, so blobs are ranked by hand evidence
+        # (fingertips, or a pinch hole) rather than size, and blobs with none are dropped
+        ranked = []
+        for area, i in outer:
+            estimate = self._estimate_landmarks(contours, hierarchy, i)
+            if estimate is None or estimate[1] == 0:
+                continue
+            ranked.append((estimate[1], area, i, estimate[0]))
+        ranked.sort(key=lambda item: item[:2], reverse=True)
+
+        hands = []
+        size = np.array((sw, sh), dtype=np.float32)
+        for _, _, i, landmarks in ranked[:self.settings.max_hands]:
+            hull = cv2.convexHull(contours[i]).reshape(-1, 2).astype(np.float32)
+            hands.append(ContourHand(landmarks / size, hull / size))
+        return hands
+
+    def _estimate_landmarks(self, contours, hierarchy, index: int) -> Optional[Tuple[np.ndarray, int]]:
+        """Return the blob's landmarks and its hand evidence: fingertips found plus one for a pinch hole"""
+        contour = contours[index]
+        x, y, bw, bh = cv2.boundingRect(contour)
+
+        # Palm center is the point deepest inside the blob; its depth is the palm radius
+        blob = np.zeros((bh, bw), dtype=np.uint8)
+        cv2.drawContours(blob, [contour], -1, 255, -1, offset=(-x, -y))
+        distance = cv2.distanceTransform(blob, cv2.DIST_L2, 3)
+        _, radius, _, (cx, cy) = cv2.minMaxLoc(distance)
+        if radius < 2:
+            return None
+        center = np.array((cx + x, cy + y), dtype=np.float32)
+
+        tips = self._find_fingertips(contour, center, radius)
+        pinch_point = self._find_pinch_hole(contours, hierarchy, index, radius)
+
+        landmarks = np.empty((21, 2), dtype=np.float32)
+        landmarks[0] = center
+        slots = self._assign_fingers(tips, center)
+        for finger, base in enumerate(FINGER_BASES):
+            angle = math.radians(FINGER_ANGLES[finger])
+            direction = np.array((math.sin(angle), -math.cos(angle)), dtype=np.float32)
+            knuckle = center + direction * radius
+            if finger in slots:
+                tip = slots[finger]
+            else:
+                tip = center + np.array(FOLDED_OFFSETS[finger], dtype=np.float32) * radius
+            if pinch_point is not None and finger in (0, 1):
+                tip = pinch_point
+            landmarks[base] = knuckle
+            landmarks[base + 1] = knuckle + (tip - knuckle) / 3
+            landmarks[base + 2] = knuckle + (tip - knuckle) * 2 / 3
+            landmarks[base + 3] = tip
+        return landmarks, len(tips) + (pinch_point is not None)
+
+    def _find_fingertips(self, contour: np.ndarray, center: np.ndarray, radius: float) -> List[np.ndarray]:
+        """Fingertips are hull points far from the palm that bound a deep convexity defect.
+
+        An extended finger leaves a valley on each side of it between the contour and the hull;
+        a fist, face or forearm blob has none, so it yields no fingertips at all.
+        """
+        hull = cv2.convexHull(contour, returnPoints=False)
+        if hull is None or len(hull) < 4:
+            return []
+        try:
+            defects = cv2.convexityDefects(contour, hull)
+        except cv2.error:
+            return []  # Self-intersecting contours can give a hull OpenCV refuses to use
+        if defects is None:
+            return []
+
+        defects = defects.reshape(-1, 4)
+        valleys = defects[defects[:, 3] / 256.0 > self.VALLEY_DEPTH * radius]
+        points = contour.reshape(-1, 2)[np.unique(valleys[:, :2])].astype(np.float32)
+        offsets = points - center
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        # Far from the palm and not below it, which rules out the wrist and forearm
+        candidates = np.where((distances > self.TIP_DISTANCE * radius) & (offsets[:, 1] < radius))[0]
+
+        tips: List[Tuple[float, np.ndarray]] = []
+        merge = self.TIP_MERGE * radius
+        for i in candidates[np.argsort(-distances[candidates])]:
+            point = points[i]
+            if all(np.hypot(*(point - other)) > merge for _, other in tips):
+                tips.append((distances[i], point))
+            if len(tips) == 5:
+                break
+        return [point for _, point in tips]
+
+    def _assign_fingers(self, tips: List[np.ndarray], center: np.ndarray) -> dict:
+        """Map fingertips to fingers, keeping their left-to-right order and nearest expected angles"""
+        if not tips:
+            return {}
+        angles = [math.degrees(math.atan2(tip[0] - center[0], center[1] - tip[1])) for tip in tips]
+        order = sorted(range(len(tips)), key=lambda i: angles[i])
+        best, best_cost = None, float('inf')
+        for fingers in itertools.combinations(range(5), len(tips)):
+            cost = sum(abs(angles[i] - FINGER_ANGLES[f]) for i, f in zip(order, fingers))
+            if cost < best_cost:
+                best, best_cost = fingers, cost
+        return {finger: tips[i] for i, finger in zip(order, best)}
+
+    def _find_pinch_hole(self, contours, hierarchy, index: int, radius: float) -> Optional[np.ndarray]:
+        """Thumb and index touching close a loop, which shows up as a hole in the hand blob"""
+        child = hierarchy[index][2]
+        min_area = math.pi * (0.25 * radius) ** 2
+        while child != -1:
+            if cv2.contourArea(contours[child]) >= min_area:
+                hole = contours[child].reshape(-1, 2)
+                return hole[hole[:, 1].argmin()].astype(np.float32)
+            child = hierarchy[child][0]
+        return None
+
+    def _smooth(self, hands: List[ContourHand]):
+        """Blend each hand with the previous frame's hand whose palm is nearest, if close enough"""
+        alpha = self.settings.smoothing
+        if alpha > 0:
+            unmatched = list(range(len(self._previous)))
+            for hand in hands:
+                if not unmatched:
+                    break
+                distances = [np.hypot(*(self._previous[j][0] - hand.landmarks[0])) for j in unmatched]
+                nearest = int(np.argmin(distances))
+                if distances[nearest] <= self.MATCH_DISTANCE:
+                    previous = self._previous[unmatched.pop(nearest)]
+                    hand.landmarks = previous * alpha + hand.landmarks * (1 - alpha)
+        self._previous = [hand.landmarks for hand in hands]
+
+    def _draw_hand(self, frame: np.ndarray, hand: ContourHand):
+        h, w = frame.shape[:2]
+        size = np.array((w, h), dtype=np.float32)
+        cv2.polylines(frame, [(hand.hull * size).astype(np.int32)], True, (0, 255, 0), 1, cv2.LINE_AA)
+        points = (hand.landmarks * size).astype(np.int32)
+        cv2.circle(frame, tuple(int(v) for v in points[0]), 4, (0, 0, 255), -1)
+        for base in FINGER_BASES:
+            cv2.circle(frame, tuple(int(v) for v in points[base + 3]), 4, (255, 255, 255), -1)
+
+    def get_landmark_coordinates(self, frame: np.ndarray, hand_landmarks: ContourHand) -> np.ndarray:
+        """Return an (N, 2) int32 array of pixel coordinates, empty on failure"""
+        try:
+            h, w = frame.shape[:2]
+            coordinates = (hand_landmarks.landmarks * (w, h)).astype(np.int32)
+            if self.event_bus is not None:
+                self.event_bus.publish_landmarks(coordinates, self.timestamp, Handedness.UNKNOWN)
+            return coordinates
+        except Exception as e:
+            print(f"Error getting landmark coordinates: {str(e)}")
+            return np.empty((0, 2), dtype=np.int32)
+
+    def skip_frame(self, timestamp: Optional[float] = None):
+        """Report a frame that was not run through detection (e.g. gated as static) as handless"""
+        self.timestamp = time.monotonic() if timestamp is None else timestamp
+        if self.event_bus is not None:
+            self.event_bus.publish_landmarks(None, self.timestamp)
+
+    def get_handedness(self, hand_index: int = 0) -> Handedness:
+        # Segmentation alone can't tell a left hand from a right one
+        return Handedness.UNKNOWN
@@ -0,0 +1,270 @@
+import socket
+import struct
+import threading
+from collections import deque
+from enum import IntEnum
+from typing import Dict, List, Optional
+import numpy as np
+from config import EventSettings
+from frame_result import Action, Gesture, Handedness
+
+class EventType(IntEnum):
+    GESTURE = 1
+    LANDMARKS = 2
+    ACTION = 3
+
+# Bit masks clients send on connect to choose what they receive
+GESTURE_MASK = 1 << EventType.GESTURE
+LANDMARKS_MASK = 1 << EventType.LANDMARKS
+ACTION_MASK = 1 << EventType.ACTION
+ALL_MASK = GESTURE_MASK | LANDMARKS_MASK | ACTION_MASK
+
+# Every message on the wire is a u16 length prefix followed by one of these
+_LENGTH = struct.Struct('<H')
+_HEADER = struct.Struct('<BId')  # event type, sequence number, monotonic timestamp
+_GESTURE = struct.Struct('<BBf')  # gesture id, handedness, confidence
+_LANDMARKS = struct.Struct('<BB')  # handedness, point count (0 = no hand); then count * (int16 x, int16 y)
+_ACTION = struct.Struct('<Bf')  # action id, value (volume/brightness level, 0 for media keys)
+
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+DISCONNECT = 'disconnect'
+
+class Subscriber:
+    """Bounded per-subscriber queue; publishing never blocks on a slow reader"""
+    def __init__(self, mask: int, max_queue: int, drop_policy: str):
+        self.mask = mask
+        self.max_queue = max_queue
+        self.drop_policy = drop_policy
+        self.dropped = 0
+        self.closed = False
+        self._queue = deque()
+        self._ready = threading.Condition()
+
+    def offer(self, event_type: EventType, message: bytes):
+        if not self.mask & (1 << event_type):
+            return
+        with self._ready:
+            if self.closed:
+                return
+            if len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                if self.drop_policy == DROP_NEWEST:
+                    return
+                if self.drop_policy == DISCONNECT:
+                    self.closed = True
+                    self._ready.notify_all()
+                    return
+                self._queue.popleft()
+            self._queue.append(message)
+            self._ready.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        with self._ready:
+            if not self._ready.wait_for(lambda: self._queue or self.closed, timeout=timeout):
+                return None
+            if self._queue:
+                return self._queue.popleft()
+            return None
+
+    def close(self):
+        with self._ready:
+            self.closed = True
+            self._ready.notify_all()
+
+class EventBus:
+    def __init__(self):
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._wanted = 0  # Union of subscriber masks, so unwanted events are never encoded
+
+    def subscribe(self, mask: int = GESTURE_MASK, max_queue: int = 64,
+                  drop_policy: str = DROP_OLDEST) -> Subscriber:
+        subscriber = Subscriber(mask, max_queue, drop_policy)
+        with self._lock:
+            self._subscribers.append(subscriber)
+            self._wanted |= mask
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        subscriber.close()
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+            self._wanted = 0
+            for other in self._subscribers:
+                self._wanted |= other.mask
+
+    def wants(self, event_type: EventType) -> bool:
+        return bool(self._wanted & (1 << event_type))
+
+    def publish_gesture(self, gesture: Gesture, confidence: float, timestamp: float,
+                        handedness: Handedness = Handedness.UNKNOWN):
+        if not self.wants(EventType.GESTURE):
+            return
+        body = _GESTURE.pack(int(gesture), int(handedness), confidence)
+        self._publish(EventType.GESTURE, timestamp, body)
+
+    def publish_landmarks(self, landmarks: Optional[np.ndarray], timestamp: float,
+                          handedness: Handedness = Handedness.UNKNOWN):
+        """Publish one frame's hand; None or an empty array marks a frame without a hand"""
+        if not self.wants(EventType.LANDMARKS):
+            return
+        if landmarks is None:
+            landmarks = np.empty((0, 2), dtype=np.int32)
+        points = np.ascontiguousarray(landmarks, dtype='<i2')
+        body = _LANDMARKS.pack(int(handedness), len(points)) + points.tobytes()
+        self._publish(EventType.LANDMARKS, timestamp, body)
+
+    def publish_action(self, action: Action, value: float, timestamp: float):
+        if not self.wants(EventType.ACTION):
+            return
+        self._publish(EventType.ACTION, timestamp, _ACTION.pack(int(action), value))
+
+    def _publish(self, event_type: EventType, timestamp: float, body: bytes):
+        with self._lock:
+            self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+            payload = _HEADER.pack(event_type, self._sequence, timestamp) + body
+            message = _LENGTH.pack(len(payload)) + payload
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.offer(event_type, message)
+
+def decode_event(payload: bytes) -> Dict[str, object]:
+    """Decode one message payload (without its length prefix)"""
+    event_type, sequence, timestamp = _HEADER.unpack_from(payload)
+    event = {'type': EventType(event_type), 'sequence': sequence, 'timestamp': timestamp}
+    offset = _HEADER.size
+    if event_type == EventType.GESTURE:
+        gesture, handedness, confidence = _GESTURE.unpack_from(payload, offset)
+        event.update(gesture=Gesture(gesture), handedness=Handedness(handedness), confidence=confidence)
+    elif event_type == EventType.LANDMARKS:
+        handedness, count = _LANDMARKS.unpack_from(payload, offset)
+        offset += _LANDMARKS.size
+        points = np.frombuffer(payload, dtype='<i2', count=count * 2, offset=offset)
+        # Widen back to the int32 HandTracker produces so arithmetic on them can't overflow
+        event.update(handedness=Handedness(handedness), landmarks=points.reshape(count, 2).astype(np.int32))
+    elif event_type == EventType.ACTION:
+        action, value = _ACTION.unpack_from(payload, offset)
+        event.update(action=Action(action), value=value)
+    return event
+
+class EventServer:
+    """Streams bus events to local clients over TCP on the loopback interface.
+
+    A client may send one byte with its subscription mask right after connecting;
+    clients that send nothing within a second get gestures only.
+    """
+    def __init__(self, bus: EventBus, settings: EventSettings):
+        self.bus = bus
+        self.settings = settings
+        self._socket: Optional[socket.socket] = None
+        self._running = False
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def port(self) -> int:
+        return self._socket.getsockname()[1] if self._socket is not None else self.settings.port
+
+    def start(self) -> bool:
+        try:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._socket.bind((self.settings.host, self.settings.port))
+            self._socket.listen()
+            self._socket.settimeout(0.5)
+            self._running = True
+            thread = threading.Thread(target=self._accept_loop, name='event-server', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+            return True
+        except Exception as e:
+            print(f"Error starting event server: {str(e)}")
+            self.stop()
+            return False
+
+    def _accept_loop(self):
+        listener = self._socket
+        while self._running:
+            try:
+                connection, _ = listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            thread = threading.Thread(target=self._serve_client, args=(connection,),
+                                      name='event-client', daemon=True)
+            thread.start()
+            self._threads = [t for t in self._threads if t.is_alive()] + [thread]
+
+    def _serve_client(self, connection: socket.socket):
+        subscriber = None
+        try:
+            connection.settimeout(1.0)
+            try:
+                requested = connection.recv(1)
+                mask = requested[0] if requested else GESTURE_MASK
+            except socket.timeout:
+                mask = GESTURE_MASK
+            if not self.settings.stream_landmarks:
+                mask &= ~LANDMARKS_MASK
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection.settimeout(self.settings.send_timeout)
+
+            subscriber = self.bus.subscribe(mask, self.settings.max_queue, self.settings.drop_policy)
+            while self._running and not subscriber.closed:
+                message = subscriber.get(timeout=0.5)
+                if message is not None:
+                    connection.sendall(message)
+        except OSError:
+            pass
+        except Exception as e:
+            print(f"Error serving event client: {str(e)}")
+        finally:
+            if subscriber is not None:
+                self.bus.unsubscribe(subscriber)
+            connection.close()
+
+    def stop(self):
+        self._running = False
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+
+class EventClient:
+    """Minimal local client, e.g. for a signage player or for checking the stream by hand"""
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, mask: int = GESTURE_MASK):
+        self.connection = socket.create_connection((host, port))
+        self.connection.sendall(bytes([mask]))
+
+    def _recv_exact(self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.connection.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Event server closed the connection")
+            data.extend(chunk)
+        return bytes(data)
+
+    def receive(self) -> Dict[str, object]:
+        length, = _LENGTH.unpack(self._recv_exact(_LENGTH.size))
+        return decode_event(self._recv_exact(length))
+
+    def close(self):
+        self.connection.close()
+
+if __name__ == "__main__":
+    client = EventClient(mask=GESTURE_MASK | LANDMARKS_MASK)
+    try:
+        while True:
+            event = client.receive()
+            if event['type'] == EventType.GESTURE:
+                print(f"{event['timestamp']:.3f} {event['gesture'].label} ({event['confidence']:.2f})")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
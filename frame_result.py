@@ -0,0 +1,58 @@
+from enum import IntEnum
+import numpy as np
+from typing import Optional
+
+class Gesture(IntEnum):
+    NONE = 0
+    PINCH = 1
+    SWIPE_LEFT = 2
+    SWIPE_RIGHT = 3
+    VOLUME_UP = 4
+    VOLUME_DOWN = 5
+    BRIGHTNESS_UP = 6
+    BRIGHTNESS_DOWN = 7
+    ROTATE_CLOCKWISE = 8
+    ROTATE_COUNTERCLOCKWISE = 9
+
+    @property
+    def label(self) -> str:
+        """Lower-case name, matching the keys used in ColorScheme.base"""
+        return self.name.lower()
+
+class Handedness(IntEnum):
+    UNKNOWN = 0
+    LEFT = 1
+    RIGHT = 2
+
+class Action(IntEnum):
+    VOLUME = 1
+    BRIGHTNESS = 2
+    PLAY_PAUSE = 3
+    NEXT_TRACK = 4
+    PREV_TRACK = 5
+    SEEK_FORWARD = 6
+    SEEK_BACKWARD = 7
+
+class FrameResult:
+    """Per-frame record shared by the capture, tracking, recognition and UI stages"""
+    __slots__ = ('frame_id', 'capture_time', 'landmarks', 'handedness', 'gesture', 'confidence')
+
+    def __init__(self, frame_id: int, capture_time: float,
+                 landmarks: Optional[np.ndarray] = None,
+                 handedness: Handedness = Handedness.UNKNOWN,
+                 gesture: Gesture = Gesture.NONE,
+                 confidence: float = 0.0):
+        self.frame_id = frame_id
+        self.capture_time = capture_time
+        self.landmarks = landmarks  # (21, 2) int32 pixel coordinates, or None without a hand
+        self.handedness = handedness
+        self.gesture = gesture
+        self.confidence = confidence  # Score of the fired gesture, else the best score this frame
+
+    @property
+    def has_hand(self) -> bool:
+        return self.landmarks is not None and len(self.landmarks) > 0
+
+    def __repr__(self) -> str:
+        return (f"FrameResult(frame_id={self.frame_id}, gesture={self.gesture.label}, "
+                f"confidence={self.confidence:.2f}, has_hand={self.has_hand})")
@@ -1,106 +1,200 @@
 from typing import List, Tuple, Dict, Optional
 import numpy as np
+from collections import deque
+from enum import IntEnum
 from config import GestureThresholds
+from events import EventBus
+from frame_result import FrameResult, Gesture, Handedness
 import math
+import time
+
+class Phase(IntEnum):
+    IDLE = 0
+    CANDIDATE = 1
+    ACTIVE = 2
+    RELEASE = 3
+
+class GestureState:
+    __slots__ = ('phase', 'since', 'last_fired')
+
+    def __init__(self):
+        self.phase = Phase.IDLE
+        self.since = 0.0  # Time the current phase was entered
+        self.last_fired = 0.0
 
 class GestureRecognizer:
-    def __init__(self, thresholds: GestureThresholds):
+    # Held gestures that keep firing every repeat_ms; the rest fire once per activation
+    REPEATING = (Gesture.VOLUME_UP, Gesture.VOLUME_DOWN,
+                 Gesture.BRIGHTNESS_UP, Gesture.BRIGHTNESS_DOWN)
+
+    def __init__(self, thresholds: GestureThresholds, event_bus: Optional[EventBus] = None):
         self.thresholds = thresholds
+        self.event_bus = event_bus
         self.gestures = {
-            'pinch': self._detect_pinch,
-            'swipe_left': self._detect_swipe_left,
-            'swipe_right': self._detect_swipe_right,
-            'volume_up': self._detect_volume_up,
-            'volume_down': self._detect_volume_down,
-            'brightness_up': self._detect_brightness_up,
-            'brightness_down': self._detect_brightness_down,
-            'rotate_clockwise': self._detect_rotation_clockwise,
-            'rotate_counterclockwise': self._detect_rotation_counterclockwise
+            Gesture.PINCH: self._detect_pinch,
+            Gesture.SWIPE_LEFT: self._detect_swipe_left,
+            Gesture.SWIPE_RIGHT: self._detect_swipe_right,
+            Gesture.VOLUME_UP: self._detect_volume_up,
+            Gesture.VOLUME_DOWN: self._detect_volume_down,
+            Gesture.BRIGHTNESS_UP: self._detect_brightness_up,
+            Gesture.BRIGHTNESS_DOWN: self._detect_brightness_down,
+            Gesture.ROTATE_CLOCKWISE: self._detect_rotation_clockwise,
+            Gesture.ROTATE_COUNTERCLOCKWISE: self._detect_rotation_counterclockwise
         }
-        self.previous_coordinates = None
-        self.gesture_cooldown = 0
-        self.gesture_history = []
-        self.min_gesture_confidence = 0.7
-        
-    def _calculate_confidence(self, value: float, threshold: float) -> float:
-        """Calculate confidence score for a gesture based on how well it meets the threshold"""
-        return min(1.0, value / threshold) if value > threshold else 0.0
+        self.states = [GestureState() for _ in Gesture]
+        self.scores = np.zeros(len(Gesture), dtype=np.float32)
+        self.motion_history = deque(maxlen=32)  # (timestamp, palm_x, palm_y, angle)
+        self.last_confidence = 0.0
+        self._hand_scale = 1.0
+        self._motion: Optional[Tuple[float, float]] = None
+
+    def recognize_gesture(self, coordinates: np.ndarray, timestamp: Optional[float] = None,
+                          handedness: Handedness = Handedness.UNKNOWN) -> Gesture:
+        """Score every gesture and advance its state machine; return the gesture that fired, if any.
 
-    def recognize_gesture(self, coordinates: List[Tuple[int, int]]) -> Optional[str]:
+        A gesture fires candidate_ms after its score crosses enter_confidence, so latency is
+        bounded by candidate_ms plus one frame interval regardless of the frame rate.
+        """
         try:
-            if not coordinates or self.gesture_cooldown > 0:
-                self.gesture_cooldown = max(0, self.gesture_cooldown - 1)
-                return None
-
-            # Calculate confidence for each gesture
-            gesture_confidences = {}
-            for gesture_name, detect_func in self.gestures.items():
-                confidence = detect_func(coordinates)
-                if confidence > self.min_gesture_confidence:
-                    gesture_confidences[gesture_name] = confidence
-
-            # Update gesture history
-            if gesture_confidences:
-                self.gesture_history.append(max(gesture_confidences.items(), key=lambda x: x[1]))
-            if len(self.gesture_history) > 3:
-                self.gesture_history.pop(0)
-
-            self.previous_coordinates = coordinates
-            
-            # Return most confident gesture with temporal smoothing
-            if gesture_confidences and len(self.gesture_history) >= 2:
-                most_common = max(set(g for g, _ in self.gesture_history), 
-                                key=lambda g: sum(1 for x, _ in self.gesture_history if x == g))
-                self.gesture_cooldown = 8  # Reduced cooldown for more responsive controls
-                return most_common
-            return None
+            now = time.monotonic() if timestamp is None else timestamp
+            self.last_confidence = 0.0
+            self.scores[:] = 0.0
+
+            if coordinates is None or len(coordinates) == 0:
+                self.motion_history.clear()
+            else:
+                self._update_motion(coordinates, now)
+                for gesture, detect_func in self.gestures.items():
+                    self.scores[gesture] = detect_func(coordinates)
+
+            gesture = self._advance_states(now)
+            if gesture and self.event_bus is not None:
+                self.event_bus.publish_gesture(gesture, self.last_confidence, now, handedness)
+            return gesture
 
         except Exception as e:
             print(f"Error in gesture recognition: {str(e)}")
-            return None
+            return Gesture.NONE
+
+    def process(self, result: FrameResult) -> Gesture:
+        """Run recognition on a frame's landmarks and fill in its gesture and confidence"""
+        result.gesture = self.recognize_gesture(result.landmarks, result.capture_time, result.handedness)
+        result.confidence = self.last_confidence if result.gesture else float(self.scores.max())
+        return result.gesture
+
+    def _advance_states(self, now: float) -> Gesture:
+        enter = self.thresholds.enter_confidence
+        exit_ = self.thresholds.exit_confidence
+        candidate_s = self.thresholds.candidate_ms / 1000
+        release_s = self.thresholds.release_ms / 1000
+        repeat_s = self.thresholds.repeat_ms / 1000
+
+        # Only one gesture may be active at a time; the others wait until it re-arms
+        owner = next((g for g in self.gestures
+                      if self.states[g].phase in (Phase.ACTIVE, Phase.RELEASE)), None)
+
+        fired = []
+        for gesture in self.gestures:
+            state = self.states[gesture]
+            score = self.scores[gesture]
+
+            if state.phase == Phase.IDLE:
+                if score >= enter and owner is None:
+                    state.phase, state.since = Phase.CANDIDATE, now
+
+            if state.phase == Phase.CANDIDATE:
+                if score < exit_:
+                    state.phase, state.since = Phase.IDLE, now
+                elif score < enter:
+                    # Still a candidate, but the hold above enter_confidence starts over
+                    state.since = now
+                elif owner is None and now - state.since >= candidate_s:
+                    fired.append(gesture)
+
+            elif state.phase == Phase.ACTIVE:
+                if score < exit_:
+                    state.phase, state.since = Phase.RELEASE, now
+                elif gesture in self.REPEATING and now - state.last_fired >= repeat_s:
+                    fired.append(gesture)
+
+            elif state.phase == Phase.RELEASE:
+                if score >= exit_:
+                    # Dropout shorter than release_ms: treat as the same activation, don't re-fire
+                    state.phase, state.since = Phase.ACTIVE, now
+                elif now - state.since >= release_s:
+                    state.phase, state.since = Phase.IDLE, now
+
+        if not fired:
+            return Gesture.NONE
+
+        # Several candidates maturing on the same frame: the strongest one wins
+        best = max(fired, key=lambda g: self.scores[g])
+        state = self.states[best]
+        if state.phase != Phase.ACTIVE:
+            state.phase, state.since = Phase.ACTIVE, now
+        state.last_fired = now
+        for gesture in fired:
+            if gesture != best and self.states[gesture].phase == Phase.CANDIDATE:
+                self.states[gesture].phase, self.states[gesture].since = Phase.IDLE, now
+        self.last_confidence = float(self.scores[best])
+        return best
+
+    def _update_motion(self, coordinates: np.ndarray, now: float):
+        """Measure palm travel and hand rotation over motion_window_ms, independent of frame rate"""
+        self._hand_scale = max(1.0, float(np.hypot(*(coordinates[9] - coordinates[0]))))
+        angle = self._calculate_angle(coordinates[0], coordinates[8])
+        self.motion_history.append((now, float(coordinates[0][0]), float(coordinates[0][1]), angle))
+
+        self._motion = None
+        if len(self.motion_history) < 2:
+            return
+
+        window = self.thresholds.motion_window_ms / 1000
+        # Newest sample at least one window old, else the oldest one we have
+        reference = self.motion_history[0]
+        for sample in reversed(list(self.motion_history)[:-1]):
+            if now - sample[0] >= window:
+                reference = sample
+                break
+
+        dt = now - reference[0]
+        if dt <= 0 or dt > 3 * window:
+            # Stale history (hand re-acquired after a gap) says nothing about current motion
+            return
+
+        scale = window / dt
+        dx = (coordinates[0][0] - reference[1]) * scale
+        dangle = (angle - reference[3] + 180) % 360 - 180
+        self._motion = (float(dx), dangle * scale)
+
+    def _ramp(self, value: float, threshold: float, width: float) -> float:
+        """Continuous score: 0.5 at the threshold, reaching 0/1 one width either side of it"""
+        if width <= 0:
+            return 1.0 if value > threshold else 0.0
+        return min(1.0, max(0.0, (value - threshold + width) / (2 * width)))
+
+    def _calculate_confidence(self, value: float, threshold: float) -> float:
+        """Calculate confidence score for a gesture based on how well it meets the threshold"""
+        return self._ramp(value, threshold, threshold * self.thresholds.score_softness)
+
+    def _less(self, a: float, b: float) -> float:
+        """Score that a < b, softened by a margin proportional to hand size"""
+        return self._ramp(b - a, 0.0, self._hand_scale * self.thresholds.score_margin)
 
     def _calculate_angle(self, p1: Tuple[int, int], p2: Tuple[int, int]) -> float:
         return math.degrees(math.atan2(p2[1] - p1[1], p2[0] - p1[0]))
 
-    def _detect_rotation_clockwise(self, coordinates: List[Tuple[int, int]]) -> float:
-        try:
-            if self.previous_coordinates is None:
-                return 0.0
-
-            prev_angle = self._calculate_angle(
-                self.previous_coordinates[0],
-                self.previous_coordinates[8]
-            )
-            current_angle = self._calculate_angle(
-                coordinates[0],
-                coordinates[8]
-            )
-            
-            angle_diff = (current_angle - prev_angle) % 360
-            return self._calculate_confidence(angle_diff, self.thresholds.rotation_angle)
-        except Exception:
+    def _detect_rotation_clockwise(self, coordinates: np.ndarray) -> float:
+        if self._motion is None:
             return 0.0
+        return self._calculate_confidence(self._motion[1], self.thresholds.rotation_angle)
 
-    def _detect_rotation_counterclockwise(self, coordinates: List[Tuple[int, int]]) -> float:
-        try:
-            if self.previous_coordinates is None:
-                return 0.0
-
-            prev_angle = self._calculate_angle(
-                self.previous_coordinates[0],
-                self.previous_coordinates[8]
-            )
-            current_angle = self._calculate_angle(
-                coordinates[0],
-                coordinates[8]
-            )
-            
-            angle_diff = (prev_angle - current_angle) % 360
-            return self._calculate_confidence(angle_diff, self.thresholds.rotation_angle)
-        except Exception:
+    def _detect_rotation_counterclockwise(self, coordinates: np.ndarray) -> float:
+        if self._motion is None:
             return 0.0
+        return self._calculate_confidence(-self._motion[1], self.thresholds.rotation_angle)
 
-    def _detect_pinch(self, coordinates: List[Tuple[int, int]]) -> bool:
+    def _detect_pinch(self, coordinates: np.ndarray) -> float:
         try:
             thumb_tip = coordinates[4]
             index_tip = coordinates[8]
@@ -108,141 +202,137 @@ class GestureRecognizer:
             ring_tip = coordinates[16]
             pinky_tip = coordinates[20]
             palm_center = coordinates[0]
-            
+
             # Calculate pinch distance
             pinch_distance = np.sqrt(
-                (thumb_tip[0] - index_tip[0])**2 + 
+                (thumb_tip[0] - index_tip[0])**2 +
                 (thumb_tip[1] - index_tip[1])**2
             )
-            
+            close = self._ramp(self.thresholds.pinch_distance - pinch_distance, 0.0,
+                               self.thresholds.pinch_distance * self.thresholds.score_softness)
+
             # Check if other fingers are folded (closer to palm)
-            others_folded = (
-                middle_tip[1] > palm_center[1] and
-                ring_tip[1] > palm_center[1] and
-                pinky_tip[1] > palm_center[1]
+            others_folded = min(
+                self._less(palm_center[1], middle_tip[1]),
+                self._less(palm_center[1], ring_tip[1]),
+                self._less(palm_center[1], pinky_tip[1])
             )
-            
-            return pinch_distance < self.thresholds.pinch_distance and others_folded
+
+            return min(close, others_folded)
         except Exception:
-            return False
+            return 0.0
 
-    def _detect_swipe_left(self, coordinates: List[Tuple[int, int]]) -> bool:
+    def _detect_swipe_left(self, coordinates: np.ndarray) -> float:
         try:
-            if self.previous_coordinates is None:
-                return False
-            
-            palm_center = coordinates[0]
-            prev_palm_center = self.previous_coordinates[0]
-            
+            if self._motion is None:
+                return 0.0
+
             # Check if hand is open by verifying finger spread
             fingers_spread = self._check_fingers_spread(coordinates)
-            
-            horizontal_movement = palm_center[0] - prev_palm_center[0]
-            return horizontal_movement < -self.thresholds.swipe_distance and fingers_spread
+
+            horizontal_movement = self._motion[0]
+            return min(self._calculate_confidence(-horizontal_movement, self.thresholds.swipe_distance),
+                       fingers_spread)
         except Exception:
-            return False
+            return 0.0
 
-    def _detect_swipe_right(self, coordinates: List[Tuple[int, int]]) -> bool:
+    def _detect_swipe_right(self, coordinates: np.ndarray) -> float:
         try:
-            if self.previous_coordinates is None:
-                return False
-            
-            palm_center = coordinates[0]
-            prev_palm_center = self.previous_coordinates[0]
-            
+            if self._motion is None:
+                return 0.0
+
             # Check if hand is open by verifying finger spread
             fingers_spread = self._check_fingers_spread(coordinates)
-            
-            horizontal_movement = palm_center[0] - prev_palm_center[0]
-            return horizontal_movement > self.thresholds.swipe_distance and fingers_spread
+
+            horizontal_movement = self._motion[0]
+            return min(self._calculate_confidence(horizontal_movement, self.thresholds.swipe_distance),
+                       fingers_spread)
         except Exception:
-            return False
+            return 0.0
 
-    def _check_fingers_spread(self, coordinates: List[Tuple[int, int]]) -> bool:
-        """Helper method to check if fingers are spread (open hand)"""
+    def _check_fingers_spread(self, coordinates: np.ndarray) -> float:
+        """Helper method to score how spread the fingers are (open hand)"""
         try:
             palm_center = coordinates[0]
             finger_tips = [coordinates[i] for i in [8, 12, 16, 20]]  # Index to pinky tips
-            
+
             # Check if all fingers are raised above palm
-            all_raised = all(tip[1] < palm_center[1] for tip in finger_tips)
-            
+            all_raised = min(self._less(tip[1], palm_center[1]) for tip in finger_tips)
+
             # Check if fingers have horizontal spacing
             finger_x_coords = [tip[0] for tip in finger_tips]
             min_spacing = 10  # Minimum pixel spacing between fingers
-            properly_spaced = all(finger_x_coords[i] - finger_x_coords[i-1] > min_spacing 
-                                for i in range(1, len(finger_x_coords)))
-            
-            return all_raised and properly_spaced
+            properly_spaced = min(self._ramp(finger_x_coords[i] - finger_x_coords[i-1], min_spacing, min_spacing / 2)
+                                  for i in range(1, len(finger_x_coords)))
+
+            return min(all_raised, properly_spaced)
         except Exception:
-            return False
+            return 0.0
 
-    def _detect_volume_up(self, coordinates: List[Tuple[int, int]]) -> bool:
+    def _detect_volume_up(self, coordinates: np.ndarray) -> float:
         try:
             palm_center = coordinates[0]
             middle_finger_tip = coordinates[12]
             middle_finger_base = coordinates[9]
             index_tip = coordinates[8]
             ring_tip = coordinates[16]
-            
+
             # Check if middle finger is raised and others are lower
-            middle_raised = middle_finger_tip[1] < palm_center[1] - self.thresholds.vertical_gesture_distance
-            index_lower = index_tip[1] > middle_finger_base[1]
-            ring_lower = ring_tip[1] > middle_finger_base[1]
-            
-            return middle_raised and index_lower and ring_lower
+            middle_raised = self._calculate_confidence(palm_center[1] - middle_finger_tip[1],
+                                                       self.thresholds.vertical_gesture_distance)
+            index_lower = self._less(middle_finger_base[1], index_tip[1])
+            ring_lower = self._less(middle_finger_base[1], ring_tip[1])
+
+            return min(middle_raised, index_lower, ring_lower)
         except Exception:
-            return False
+            return 0.0
 
-    def _detect_volume_down(self, coordinates: List[Tuple[int, int]]) -> bool:
+    def _detect_volume_down(self, coordinates: np.ndarray) -> float:
         try:
             palm_center = coordinates[0]
             middle_finger_tip = coordinates[12]
-            middle_finger_base = coordinates[9]
             index_tip = coordinates[8]
             ring_tip = coordinates[16]
-            
+
             # Check if middle finger is lowered and others are higher
-            middle_lowered = middle_finger_tip[1] > palm_center[1] + self.thresholds.vertical_gesture_distance
-            index_higher = index_tip[1] < middle_finger_tip[1]
-            ring_higher = ring_tip[1] < middle_finger_tip[1]
-            
-            return middle_lowered and index_higher and ring_higher
+            middle_lowered = self._calculate_confidence(middle_finger_tip[1] - palm_center[1],
+                                                        self.thresholds.vertical_gesture_distance)
+            index_higher = self._less(index_tip[1], middle_finger_tip[1])
+            ring_higher = self._less(ring_tip[1], middle_finger_tip[1])
+
+            return min(middle_lowered, index_higher, ring_higher)
         except Exception:
-            return False
+            return 0.0
 
-    def _detect_brightness_up(self, coordinates: List[Tuple[int, int]]) -> bool:
+    def _detect_brightness_up(self, coordinates: np.ndarray) -> float:
         try:
             palm_center = coordinates[0]
             index_tip = coordinates[8]
             index_base = coordinates[5]
             middle_tip = coordinates[12]
-            
+
             # Check if index finger is raised on right side and others are lower
-            index_raised = index_tip[1] < palm_center[1] - self.thresholds.vertical_gesture_distance
-            on_right_side = index_tip[0] > palm_center[0]
-            middle_lower = middle_tip[1] > index_base[1]
-            
-            return index_raised and on_right_side and middle_lower
+            index_raised = self._calculate_confidence(palm_center[1] - index_tip[1],
+                                                      self.thresholds.vertical_gesture_distance)
+            on_right_side = self._less(palm_center[0], index_tip[0])
+            middle_lower = self._less(index_base[1], middle_tip[1])
+
+            return min(index_raised, on_right_side, middle_lower)
         except Exception:
-            return False
+            return 0.0
 
-    def _detect_brightness_down(self, coordinates: List[Tuple[int, int]]) -> bool:
+    def _detect_brightness_down(self, coordinates: np.ndarray) -> float:
         try:
             palm_center = coordinates[0]
             index_tip = coordinates[8]
-            index_base = coordinates[5]
             middle_tip = coordinates[12]
-            
-            # Check if index finger is lowered on right side and others are higher
-            index_lowered = index_tip[1] > palm_center[1] + self.thresholds.vertical_gesture_distance
-            on_right_side = index_tip[0] > palm_center[0]
-            middle_higher = middle_tip[1] < index_tip[1]
-            
-            return index_lowered and on_right_side and middle_higher
-        except Exception:
-            return False
-
-
 
+            # Check if index finger is lowered on right side and others are higher
+            index_lowered = self._calculate_confidence(index_tip[1] - palm_center[1],
+                                                       self.thresholds.vertical_gesture_distance)
+            on_right_side = self._less(palm_center[0], index_tip[0])
+            middle_higher = self._less(middle_tip[1], index_tip[1])
 
+            return min(index_lowered, on_right_side, middle_higher)
+        except Exception:
+            return 0.0
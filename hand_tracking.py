@@ -1,10 +1,14 @@
 import cv2
 import mediapipe as mp
 import numpy as np
+import time
 from typing import Tuple, List, Optional
+from events import EventBus
+from frame_result import Handedness
 
 class HandTracker:
-    def __init__(self, max_hands: int = 2, detection_confidence: float = 0.5, tracking_confidence: float = 0.5):
+    def __init__(self, max_hands: int = 2, detection_confidence: float = 0.5, tracking_confidence: float = 0.5,
+                 event_bus: Optional[EventBus] = None):
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(
             max_num_hands=max_hands,
@@ -12,9 +16,13 @@ class HandTracker:
             min_tracking_confidence=tracking_confidence
         )
         self.mp_draw = mp.solutions.drawing_utils
+        self.event_bus = event_bus
+        self.timestamp = 0.0
         
-    def find_hands(self, frame: np.ndarray, draw: bool = True) -> Tuple[np.ndarray, List]:
+    def find_hands(self, frame: np.ndarray, draw: bool = True,
+                   timestamp: Optional[float] = None) -> Tuple[np.ndarray, List]:
         try:
+            self.timestamp = time.monotonic() if timestamp is None else timestamp
             frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             self.results = self.hands.process(frame_rgb)
             landmarks = []
@@ -28,20 +36,41 @@ class HandTracker:
                             self.mp_hands.HAND_CONNECTIONS
                         )
                     landmarks.append(hand_landmarks)
+            elif self.event_bus is not None:
+                self.event_bus.publish_landmarks(None, self.timestamp)
             
             return frame, landmarks
         except Exception as e:
             print(f"Error in hand detection: {str(e)}")
             return frame, []
 
-    def get_landmark_coordinates(self, frame: np.ndarray, hand_landmarks) -> List[Tuple[int, int]]:
+    def get_landmark_coordinates(self, frame: np.ndarray, hand_landmarks) -> np.ndarray:
+        """Return an (N, 2) int32 array of pixel coordinates, empty on failure"""
         try:
             h, w, _ = frame.shape
-            coordinates = []
-            for landmark in hand_landmarks.landmark:
-                cx, cy = int(landmark.x * w), int(landmark.y * h)
-                coordinates.append((cx, cy))
+            normalized = np.array([(landmark.x, landmark.y) for landmark in hand_landmarks.landmark],
+                                  dtype=np.float32)
+            coordinates = (normalized * (w, h)).astype(np.int32)
+            if self.event_bus is not None:
+                hand_index = next((i for i, hand in enumerate(self.results.multi_hand_landmarks)
+                                   if hand is hand_landmarks), 0)
+                self.event_bus.publish_landmarks(coordinates, self.timestamp, self.get_handedness(hand_index))
             return coordinates
         except Exception as e:
             print(f"Error getting landmark coordinates: {str(e)}")
-            return []
\ No newline at end of file
+            return np.empty((0, 2), dtype=np.int32)
+
+    def skip_frame(self, timestamp: Optional[float] = None):
+        """Report a frame that was not run through detection (e.g. gated as static) as handless"""
+        self.timestamp = time.monotonic() if timestamp is None else timestamp
+        if self.event_bus is not None:
+            self.event_bus.publish_landmarks(None, self.timestamp)
+
+    def get_handedness(self, hand_index: int = 0) -> Handedness:
+        try:
+            if not self.results.multi_handedness:
+                return Handedness.UNKNOWN
+            label = self.results.multi_handedness[hand_index].classification[0].label
+            return Handedness.LEFT if label == 'Left' else Handedness.RIGHT
+        except Exception:
+            return Handedness.UNKNOWN
@@ -1,34 +1,51 @@
 import cv2
 import numpy as np
-from hand_tracking import HandTracker
+import time
+from camera import CameraCapture
+from events import EventBus, EventServer
+from recorder import SessionRecorder
+from motion import MotionDetector
 from gesture_rec import GestureRecognizer
 from sys_control import SystemController
 from ui_feedback import UIFeedback
 from config import Config
-from typing import Optional
+from frame_result import FrameResult, Gesture
+from typing import Callable, List, Optional
 
 class GestureControlApp:
     def __init__(self):
         self.config = Config()
         self.config.ui_settings.show_particles = True  # Enable particle effects
         self.config.ui_settings.show_data_vis = True   # Enable data visualization
-        self.hand_tracker = HandTracker()
-        self.gesture_recognizer = GestureRecognizer(self.config.gesture_thresholds)
-        self.system_controller = SystemController(self.config.system_settings)
+        self.motion_detector = MotionDetector(self.config.motion_settings)
+        self.event_bus = EventBus()
+        self.event_server = EventServer(self.event_bus, self.config.event_settings)
+        self.session_recorder = SessionRecorder(self.event_bus, self.config.recorder_settings)
+        self.hand_tracker = self._create_hand_tracker()
+        self.hand_tracked = False
+        self.gesture_recognizer = GestureRecognizer(self.config.gesture_thresholds, self.event_bus)
+        self.system_controller = SystemController(self.config.system_settings, self.event_bus)
         self.ui_feedback = UIFeedback(self.config.ui_settings)
-        self.cap = None
+        self.camera = CameraCapture(self.config.camera_settings)
+        self.gesture_actions = self._build_gesture_actions()
         self.window_name = 'Gesture Control'
 
-    def initialize_camera(self, camera_id: int = 0) -> bool:
+    def _create_hand_tracker(self):
+        settings = self.config.tracker_settings
+        # Imported lazily so nodes running the contour backend don't need MediaPipe installed
+        if settings.backend == 'contour':
+            from contour_tracking import ContourHandTracker
+            return ContourHandTracker(settings, event_bus=self.event_bus)
+        from hand_tracking import HandTracker
+        return HandTracker(settings.max_hands, settings.detection_confidence,
+                           settings.tracking_confidence, event_bus=self.event_bus)
+
+    def initialize_camera(self) -> bool:
         try:
-            self.cap = cv2.VideoCapture(camera_id)
-            if not self.cap.isOpened():
+            # Negotiates format/resolution/FPS and starts the latest-frame grabber thread
+            if not self.camera.open():
                 raise Exception("Failed to open camera")
             
-            # Set camera resolution to maximum supported
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1920)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 1080)
-            
             # Create fullscreen window
             cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
             cv2.setWindowProperty(self.window_name, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
@@ -38,55 +55,84 @@ class GestureControlApp:
             print(f"Error initializing camera: {str(e)}")
             return False
 
-    def handle_gesture(self, gesture: str):
-        volume, brightness = self.system_controller.get_system_status()
-        
-        if gesture == 'volume_up' and volume is not None:
-            self.system_controller.adjust_volume(volume + self.config.system_settings.volume_step)
-        elif gesture == 'volume_down' and volume is not None:
-            self.system_controller.adjust_volume(volume - self.config.system_settings.volume_step)
-        elif gesture == 'brightness_up' and brightness is not None:
-            self.system_controller.adjust_brightness(brightness + self.config.system_settings.brightness_step)
-        elif gesture == 'brightness_down' and brightness is not None:
-            self.system_controller.adjust_brightness(brightness - self.config.system_settings.brightness_step)
-        elif gesture == 'swipe_left':
-            self.system_controller.media_control('prev_track')
-        elif gesture == 'swipe_right':
-            self.system_controller.media_control('next_track')
-        elif gesture == 'pinch':
-            self.system_controller.media_control('play_pause')
-        elif gesture == 'rotate_clockwise':
-            self.system_controller.adjust_brightness(brightness + self.config.system_settings.brightness_step * 2)
-        elif gesture == 'rotate_counterclockwise':
-            self.system_controller.adjust_brightness(brightness - self.config.system_settings.brightness_step * 2)
+    def _build_gesture_actions(self) -> List[Optional[Callable[[], None]]]:
+        """Action table indexed by Gesture id"""
+        volume_step = self.config.system_settings.volume_step
+        brightness_step = self.config.system_settings.brightness_step
+        media = self.system_controller.media_control
+
+        actions: List[Optional[Callable[[], None]]] = [None] * len(Gesture)
+        actions[Gesture.VOLUME_UP] = lambda: self._step_volume(volume_step)
+        actions[Gesture.VOLUME_DOWN] = lambda: self._step_volume(-volume_step)
+        actions[Gesture.BRIGHTNESS_UP] = lambda: self._step_brightness(brightness_step)
+        actions[Gesture.BRIGHTNESS_DOWN] = lambda: self._step_brightness(-brightness_step)
+        actions[Gesture.SWIPE_LEFT] = lambda: media('prev_track')
+        actions[Gesture.SWIPE_RIGHT] = lambda: media('next_track')
+        actions[Gesture.PINCH] = lambda: media('play_pause')
+        actions[Gesture.ROTATE_CLOCKWISE] = lambda: self._step_brightness(brightness_step * 2)
+        actions[Gesture.ROTATE_COUNTERCLOCKWISE] = lambda: self._step_brightness(-brightness_step * 2)
+        return actions
+
+    def _step_volume(self, delta: float):
+        volume, _ = self.system_controller.get_system_status()
+        if volume is not None:
+            self.system_controller.adjust_volume(volume + delta)
+
+    def _step_brightness(self, delta: float):
+        _, brightness = self.system_controller.get_system_status()
+        if brightness is not None:
+            self.system_controller.adjust_brightness(brightness + delta)
+
+    def handle_gesture(self, gesture: Gesture):
+        action = self.gesture_actions[gesture]
+        if action is not None:
+            action()
 
     def run(self):
         if not self.initialize_camera():
             return
 
+        if self.config.event_settings.enabled:
+            self.event_server.start()
+        if self.config.recorder_settings.enabled:
+            self.session_recorder.start()
+
         try:
             while True:
-                success, frame = self.cap.read()
+                success, frame = self.camera.read()
                 if not success:
                     print("Failed to read frame from camera")
                     break
 
+                result = FrameResult(self.camera.frame_id, self.camera.frame_time)
+
                 # Flip frame horizontally for more intuitive interaction
                 frame = cv2.flip(frame, 1)
 
-                # Process hand tracking
-                frame, landmarks = self.hand_tracker.find_hands(frame)
+                # Process hand tracking, skipping MediaPipe while the scene is static
+                landmarks = []
+                inference_ms = None
+                if self.motion_detector.should_track(frame, self.hand_tracked):
+                    inference_start = time.perf_counter()
+                    frame, landmarks = self.hand_tracker.find_hands(frame, timestamp=result.capture_time)
+                    inference_ms = (time.perf_counter() - inference_start) * 1000
+                else:
+                    self.hand_tracker.skip_frame(result.capture_time)
+                self.hand_tracked = bool(landmarks)
                 
                 if landmarks:
-                    coordinates = self.hand_tracker.get_landmark_coordinates(frame, landmarks[0])
-                    gesture = self.gesture_recognizer.recognize_gesture(coordinates)
-                    
-                    if gesture:
-                        self.handle_gesture(gesture)
+                    result.landmarks = self.hand_tracker.get_landmark_coordinates(frame, landmarks[0])
+                    result.handedness = self.hand_tracker.get_handedness(0)
+
+                # Runs without a hand too, so active gestures can release while none is visible
+                if self.gesture_recognizer.process(result):
+                    self.handle_gesture(result.gesture)
 
+                if result.has_hand:
                     # Update UI
                     volume, brightness = self.system_controller.get_system_status()
-                    self.ui_feedback.draw_system_status(frame, gesture, volume, brightness)
+                    self.ui_feedback.draw_system_status(frame, result, volume, brightness, inference_ms,
+                                                        self.camera.capture_fps, self.camera.frame_age * 1000)
 
                 # Scale frame to fit screen while maintaining aspect ratio
                 screen_h, screen_w = cv2.getWindowImageRect(self.window_name)[2:]
@@ -95,14 +141,16 @@ class GestureControlApp:
                 frame = cv2.resize(frame, None, fx=scale, fy=scale)
 
                 cv2.imshow(self.window_name, frame)
-                if cv2.waitKey(1) & 0xFF == 27:  # ESC key to exit
+                # Drops to idle_fps after idle_timeout without motion, wakes on the next moving frame
+                if cv2.waitKey(self.motion_detector.frame_delay_ms()) & 0xFF == 27:  # ESC key to exit
                     break
 
         except Exception as e:
             print(f"Error in main loop: {str(e)}")
         finally:
-            if self.cap is not None:
-                self.cap.release()
+            self.camera.release()
+            self.event_server.stop()
+            self.session_recorder.stop()
             cv2.destroyAllWindows()
 
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+import cv2
+import numpy as np
+import time
+from typing import Optional
+from config import MotionSettings
+
+class MotionDetector:
+    def __init__(self, settings: MotionSettings):
+        self.settings = settings
+        self.previous_gray: Optional[np.ndarray] = None
+        self.motion_ratio = 0.0
+        self.last_active_time = time.monotonic()
+
+    def detect_motion(self, frame: np.ndarray) -> bool:
+        """Difference a tiny grayscale copy of the frame against the previous one"""
+        try:
+            small = cv2.resize(frame, self.settings.downsample_size, interpolation=cv2.INTER_AREA)
+            gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+            if self.previous_gray is None:
+                self.previous_gray = gray
+                return True
+
+            diff = cv2.absdiff(gray, self.previous_gray)
+            self.previous_gray = gray
+            self.motion_ratio = np.count_nonzero(diff > self.settings.pixel_threshold) / diff.size
+            return self.motion_ratio >= self.settings.motion_threshold
+        except Exception as e:
+            print(f"Error in motion detection: {str(e)}")
+            return True
+
+    def should_track(self, frame: np.ndarray, hand_tracked: bool) -> bool:
+        """Run hand tracking only while something moves or a hand is already being followed"""
+        if not self.settings.enabled:
+            return True
+
+        # A hand held still must keep being tracked, so motion only gates re-acquisition
+        active = self.detect_motion(frame) or hand_tracked
+        if active:
+            self.last_active_time = time.monotonic()
+        return active
+
+    @property
+    def is_idle(self) -> bool:
+        if not self.settings.enabled:
+            return False
+        return time.monotonic() - self.last_active_time > self.settings.idle_timeout
+
+    def frame_delay_ms(self) -> int:
+        """Delay for cv2.waitKey: throttle to idle_fps while idle, otherwise run at full rate"""
+        if self.is_idle:
+            return max(1, int(1000 / self.settings.idle_fps))
+        return 1
@@ -0,0 +1,256 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+from config import Config, GestureThresholds, RecorderSettings
+from events import ALL_MASK, DROP_NEWEST, EventBus, EventType, decode_event
+from frame_result import Gesture
+from gesture_rec import GestureRecognizer
+
+# File layout: header, then append-only compressed chunks, then (on clean close) a seek
+# index and trailer. A session cut short by a crash has no index; the reader rebuilds it
+# by walking the chunk headers.
+_FILE_HEADER = struct.Struct('<4sHH')  # magic, version, reserved
+_CHUNK_HEADER = struct.Struct('<4sIIdd')  # magic, compressed size, event count, first/last timestamp
+_INDEX_HEADER = struct.Struct('<4sI')  # magic, chunk count
+_INDEX_ENTRY = struct.Struct('<QIdd')  # file offset, event count, first/last timestamp
+_TRAILER = struct.Struct('<Q4s')  # index offset, magic
+_LENGTH = struct.Struct('<H')
+_TIMESTAMP_OFFSET = _LENGTH.size + 5  # After the length prefix, event type and sequence number
+
+FILE_MAGIC = b'GSRC'
+CHUNK_MAGIC = b'CHNK'
+INDEX_MAGIC = b'INDX'
+TRAILER_MAGIC = b'GEND'
+VERSION = 1
+
+def _message_timestamp(message: bytes) -> float:
+    return struct.unpack_from('<d', message, _TIMESTAMP_OFFSET)[0]
+
+class SessionRecorder:
+    """Writes every bus event to a chunked, zlib-compressed session log on a background thread"""
+    def __init__(self, bus: EventBus, settings: RecorderSettings):
+        self.bus = bus
+        self.settings = settings
+        self.path: Optional[str] = None
+        self._subscriber = None
+        self._file = None
+        self._thread: Optional[threading.Thread] = None
+        self._index: List[Tuple[int, int, float, float]] = []
+
+    @property
+    def dropped(self) -> int:
+        return self._subscriber.dropped if self._subscriber is not None else 0
+
+    def start(self, path: Optional[str] = None) -> bool:
+        try:
+            if path is None:
+                os.makedirs(self.settings.directory, exist_ok=True)
+                path = os.path.join(self.settings.directory,
+                                    time.strftime('session_%Y%m%d_%H%M%S.gsr'))
+            self.path = path
+            self._file = open(path, 'wb')
+            self._file.write(_FILE_HEADER.pack(FILE_MAGIC, VERSION, 0))
+            self._index = []
+
+            # Dropping new events keeps what is already recorded contiguous if the disk stalls
+            self._subscriber = self.bus.subscribe(ALL_MASK, self.settings.max_queue, DROP_NEWEST)
+            self._thread = threading.Thread(target=self._write_loop, name='session-recorder', daemon=True)
+            self._thread.start()
+            return True
+        except Exception as e:
+            print(f"Error starting session recorder: {str(e)}")
+            self.stop()
+            return False
+
+    def _write_loop(self):
+        pending: List[bytes] = []
+        deadline = time.monotonic() + self.settings.chunk_seconds
+        try:
+            while True:
+                message = self._subscriber.get(timeout=max(0.0, deadline - time.monotonic()))
+                if message is not None:
+                    pending.append(message)
+                elif self._subscriber.closed:
+                    # get() only returns None on a closed subscriber once its queue is drained
+                    if pending:
+                        self._write_chunk(pending)
+                    break
+
+                if pending and (len(pending) >= self.settings.chunk_events or time.monotonic() >= deadline):
+                    self._write_chunk(pending)
+                    pending = []
+                if time.monotonic() >= deadline:
+                    deadline = time.monotonic() + self.settings.chunk_seconds
+        except Exception as e:
+            print(f"Error writing session log: {str(e)}")
+
+    def _write_chunk(self, messages: List[bytes]):
+        first_ts = _message_timestamp(messages[0])
+        last_ts = _message_timestamp(messages[-1])
+        data = zlib.compress(b''.join(messages), self.settings.compression_level)
+        offset = self._file.tell()
+        self._file.write(_CHUNK_HEADER.pack(CHUNK_MAGIC, len(data), len(messages), first_ts, last_ts))
+        self._file.write(data)
+        self._file.flush()
+        self._index.append((offset, len(messages), first_ts, last_ts))
+
+    def stop(self):
+        if self._subscriber is not None:
+            # Closing the subscription lets the writer drain what is queued and exit
+            self.bus.unsubscribe(self._subscriber)
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        if self._file is not None:
+            index_offset = self._file.tell()
+            self._file.write(_INDEX_HEADER.pack(INDEX_MAGIC, len(self._index)))
+            for entry in self._index:
+                self._file.write(_INDEX_ENTRY.pack(*entry))
+            self._file.write(_TRAILER.pack(index_offset, TRAILER_MAGIC))
+            self._file.close()
+            self._file = None
+        self._subscriber = None
+
+class SessionReader:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        magic, version, _ = _FILE_HEADER.unpack(self._file.read(_FILE_HEADER.size))
+        if magic != FILE_MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} session log")
+        self.index = self._read_index()
+        if self.index is None:
+            self.index = self._scan_chunks()
+
+    def _read_index(self) -> Optional[List[Tuple[int, int, float, float]]]:
+        size = os.path.getsize(self.path)
+        if size < _FILE_HEADER.size + _TRAILER.size:
+            return None
+        self._file.seek(size - _TRAILER.size)
+        index_offset, magic = _TRAILER.unpack(self._file.read(_TRAILER.size))
+        if magic != TRAILER_MAGIC:
+            return None
+        self._file.seek(index_offset)
+        magic, count = _INDEX_HEADER.unpack(self._file.read(_INDEX_HEADER.size))
+        if magic != INDEX_MAGIC:
+            return None
+        return [_INDEX_ENTRY.unpack(self._file.read(_INDEX_ENTRY.size)) for _ in range(count)]
+
+    def _scan_chunks(self) -> List[Tuple[int, int, float, float]]:
+        index = []
+        offset = _FILE_HEADER.size
+        self._file.seek(offset)
+        while True:
+            header = self._file.read(_CHUNK_HEADER.size)
+            if len(header) < _CHUNK_HEADER.size:
+                break
+            magic, size, count, first_ts, last_ts = _CHUNK_HEADER.unpack(header)
+            if magic != CHUNK_MAGIC:
+                break
+            index.append((offset, count, first_ts, last_ts))
+            offset += _CHUNK_HEADER.size + size
+            self._file.seek(offset)
+        return index
+
+    @property
+    def duration(self) -> float:
+        if not self.index:
+            return 0.0
+        return self.index[-1][3] - self.index[0][2]
+
+    def events(self, start_time: Optional[float] = None) -> Iterator[Dict[str, object]]:
+        """Yield decoded events in recorded order, seeking straight to start_time via the index"""
+        for offset, _, _, last_ts in self.index:
+            if start_time is not None and last_ts < start_time:
+                continue
+            self._file.seek(offset)
+            _, size, _, _, _ = _CHUNK_HEADER.unpack(self._file.read(_CHUNK_HEADER.size))
+            try:
+                data = zlib.decompress(self._file.read(size))
+            except zlib.error:
+                break  # Torn final chunk from an interrupted session
+            position = 0
+            while position < len(data):
+                length, = _LENGTH.unpack_from(data, position)
+                position += _LENGTH.size
+                event = decode_event(data[position:position + length])
+                position += length
+                if start_time is None or event['timestamp'] >= start_time:
+                    yield event
+
+    def close(self):
+        self._file.close()
+
+def _match_gestures(recorded: List[Tuple[float, Gesture]],
+                    replayed: List[Tuple[float, Gesture]]) -> List[Tuple[Optional[Tuple[float, Gesture]],
+                                                                     Optional[Tuple[float, Gesture]]]]:
+    """Pair gestures by capture timestamp, so one missing or extra gesture doesn't shift the rest"""
+    # Each recognizer call fires at most one gesture, stamped with its frame's capture time
+    unmatched = dict(replayed)
+    mismatches = []
+    for timestamp, gesture in recorded:
+        match = unmatched.pop(timestamp, None)
+        if match != gesture:
+            mismatches.append(((timestamp, gesture), (timestamp, match) if match is not None else None))
+    mismatches.extend((None, item) for item in unmatched.items())
+    mismatches.sort(key=lambda pair: (pair[0] or pair[1])[0])
+    return mismatches
+
+def replay(path: str, thresholds: Optional[GestureThresholds] = None) -> Dict[str, object]:
+    """Feed recorded landmarks back through a fresh GestureRecognizer, as fast as possible.
+
+    The live loop publishes exactly one landmark record (empty when there was no hand) per
+    recognizer call, stamped with the same timestamp, so replaying them reproduces every
+    decision. Passing different thresholds shows what a tuning change would have done.
+    """
+    recognizer = GestureRecognizer(thresholds or Config().gesture_thresholds)
+    reader = SessionReader(path)
+    recorded: List[Tuple[float, Gesture]] = []
+    replayed: List[Tuple[float, Gesture]] = []
+    actions = []
+    frames = 0
+
+    start = time.perf_counter()
+    try:
+        for event in reader.events():
+            if event['type'] == EventType.LANDMARKS:
+                frames += 1
+                landmarks = event['landmarks'] if len(event['landmarks']) else None
+                gesture = recognizer.recognize_gesture(landmarks, event['timestamp'], event['handedness'])
+                if gesture:
+                    replayed.append((event['timestamp'], gesture))
+            elif event['type'] == EventType.GESTURE:
+                recorded.append((event['timestamp'], event['gesture']))
+            elif event['type'] == EventType.ACTION:
+                actions.append((event['timestamp'], event['action'], event['value']))
+        duration = reader.duration
+    finally:
+        reader.close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'frames': frames,
+        'recorded': recorded,
+        'replayed': replayed,
+        'actions': actions,
+        'mismatches': _match_gestures(recorded, replayed),
+        'duration': duration,
+        'elapsed': elapsed,
+    }
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay a recorded gesture session")
+    parser.add_argument('path')
+    args = parser.parse_args()
+
+    report = replay(args.path)
+    speedup = report['duration'] / report['elapsed'] if report['elapsed'] > 0 else float('inf')
+    print(f"{report['frames']} frames, {len(report['recorded'])} recorded gestures, "
+          f"{len(report['replayed'])} replayed, {len(report['actions'])} actions")
+    print(f"Replayed {report['duration']:.1f}s of session in {report['elapsed']:.2f}s ({speedup:.0f}x)")
+    for recorded, replayed in report['mismatches']:
+        print(f"Mismatch: recorded {recorded}, replayed {replayed}")
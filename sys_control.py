@@ -3,12 +3,24 @@ from comtypes import CLSCTX_ALL
 from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
 import screen_brightness_control as sbc
 import pyautogui
+import time
 from typing import Optional, Tuple
 from config import SystemControlSettings
+from events import EventBus
+from frame_result import Action
 
 class SystemController:
-    def __init__(self, settings: SystemControlSettings):
+    MEDIA_ACTIONS = {
+        'play_pause': (Action.PLAY_PAUSE, 'playpause'),
+        'next_track': (Action.NEXT_TRACK, 'nexttrack'),
+        'prev_track': (Action.PREV_TRACK, 'prevtrack'),
+        'seek_forward': (Action.SEEK_FORWARD, 'right'),
+        'seek_backward': (Action.SEEK_BACKWARD, 'left'),
+    }
+
+    def __init__(self, settings: SystemControlSettings, event_bus: Optional[EventBus] = None):
         self.settings = settings
+        self.event_bus = event_bus
         self._init_audio()
         self._init_brightness()
         pyautogui.FAILSAFE = False
@@ -37,6 +49,7 @@ class SystemController:
             value = max(0.0, min(1.0, value))
             self.volume_controller.SetMasterVolumeLevelScalar(value, None)
             self.current_volume = value
+            self._publish(Action.VOLUME, value)
             return value
         except Exception as e:
             print(f"Error adjusting volume: {str(e)}")
@@ -48,6 +61,7 @@ class SystemController:
             brightness_percent = int(value * 100)
             sbc.set_brightness(brightness_percent)
             self.current_brightness = value
+            self._publish(Action.BRIGHTNESS, value)
             return value
         except Exception as e:
             print(f"Error adjusting brightness: {str(e)}")
@@ -55,18 +69,17 @@ class SystemController:
 
     def media_control(self, action: str):
         try:
-            if action == 'play_pause':
-                pyautogui.press('playpause')
-            elif action == 'next_track':
-                pyautogui.press('nexttrack')
-            elif action == 'prev_track':
-                pyautogui.press('prevtrack')
-            elif action == 'seek_forward':
-                pyautogui.press('right')
-            elif action == 'seek_backward':
-                pyautogui.press('left')
+            if action not in self.MEDIA_ACTIONS:
+                return
+            action_id, key = self.MEDIA_ACTIONS[action]
+            pyautogui.press(key)
+            self._publish(action_id, 0.0)
         except Exception as e:
             print(f"Error in media control: {str(e)}")
 
+    def _publish(self, action: Action, value: float):
+        if self.event_bus is not None:
+            self.event_bus.publish_action(action, value, time.monotonic())
+
     def get_system_status(self) -> Tuple[Optional[float], Optional[float]]:
         return self.current_volume, self.current_brightness
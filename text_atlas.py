@@ -0,0 +1,174 @@
+import cv2
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Non-ASCII symbols the Hershey fonts can't draw, rendered once per size as line art
+ARROWS = {
+    '↑': ((0.5, 1.0), (0.5, 0.0)),
+    '↓': ((0.5, 0.0), (0.5, 1.0)),
+    '←': ((1.0, 0.5), (0.0, 0.5)),
+    '→': ((0.0, 0.5), (1.0, 0.5)),
+}
+
+class Label:
+    __slots__ = ('mask', 'binary', 'inverse', 'ascent', 'width', 'height', 'baseline', 'patches')
+
+    def __init__(self, mask: np.ndarray, ascent: int, width: int, height: int, baseline: int):
+        self.mask = mask  # uint8 coverage, 0-255
+        # Hershey text drawn with LINE_8 is fully on or off, so a masked copy reproduces it
+        # exactly; anti-aliased masks are composited as frame * (1 - alpha) + premultiplied color.
+        self.binary = bool(np.isin(mask, (0, 255)).all())
+        self.inverse = None if self.binary else cv2.merge([255 - mask] * 3)
+        self.ascent = ascent  # Rows of the mask above the baseline
+        self.width = width  # width/height/baseline as cv2.getTextSize reports them
+        self.height = height
+        self.baseline = baseline
+        self.patches: Dict[Tuple[int, int, int], np.ndarray] = {}  # Color source per color
+
+    def patch(self, color: Tuple[int, int, int]) -> np.ndarray:
+        """Solid color for binary masks, color premultiplied by coverage for anti-aliased ones"""
+        patch = self.patches.get(color)
+        if patch is None:
+            patch = np.empty(self.mask.shape + (3,), dtype=np.uint8)
+            patch[:] = color
+            if not self.binary:
+                cv2.multiply(patch, cv2.merge([self.mask] * 3), dst=patch, scale=1 / 255)
+            self.patches[color] = patch
+        return patch
+
+class LabelAtlas:
+    """Cache of rasterized text as alpha masks, blitted instead of re-running putText.
+
+    Masks don't depend on color, so one entry serves every color a label is drawn in.
+    Only worth it for text that repeats across frames: a cache miss renders the label and
+    costs several putText calls, so strings that change every frame should use putText.
+    """
+    def __init__(self, font: int = cv2.FONT_HERSHEY_SIMPLEX, max_entries: int = 256,
+                 unicode_font_path: Optional[str] = None, line_type: Optional[int] = None):
+        self.font = font
+        self.line_type = line_type  # None keeps putText's default
+        self.max_entries = max_entries
+        self.unicode_font_path = unicode_font_path
+        self._labels: 'OrderedDict[Tuple[str, float, int], Label]' = OrderedDict()
+        self._pillow_fonts: Dict[int, object] = {}
+
+    def get(self, text: str, scale: float, thickness: int = 1) -> Label:
+        key = (text, scale, thickness)
+        label = self._labels.get(key)
+        if label is not None:
+            self._labels.move_to_end(key)
+            return label
+
+        label = self._render(text, scale, thickness)
+        self._labels[key] = label
+        # Bounded so changing strings (percentages, gesture names) can't grow the cache forever
+        if len(self._labels) > self.max_entries:
+            self._labels.popitem(last=False)
+        return label
+
+    def text_size(self, text: str, scale: float, thickness: int = 1) -> Tuple[Tuple[int, int], int]:
+        """Drop-in for cv2.getTextSize, served from the cache"""
+        label = self.get(text, scale, thickness)
+        return (label.width, label.height), label.baseline
+
+    def draw(self, frame: np.ndarray, text: str, org: Tuple[int, int], scale: float,
+             color: Tuple[int, int, int], thickness: int = 1):
+        """Drop-in for cv2.putText: org is the left end of the baseline"""
+        label = self.get(text, scale, thickness)
+        x, y = org[0], org[1] - label.ascent
+        h, w = frame.shape[:2]
+        mh, mw = label.mask.shape
+
+        # Clip to the frame, like putText does
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(w, x + mw), min(h, y + mh)
+        if x0 >= x1 or y0 >= y1:
+            return
+        rows, cols = slice(y0 - y, y1 - y), slice(x0 - x, x1 - x)
+        region = frame[y0:y1, x0:x1]
+        patch = label.patch(tuple(color))[rows, cols]
+        if label.binary:
+            cv2.copyTo(patch, label.mask[rows, cols], region)
+        else:
+            cv2.multiply(region, label.inverse[rows, cols], dst=region, scale=1 / 255)
+            cv2.add(region, patch, dst=region)
+
+    def _render(self, text: str, scale: float, thickness: int) -> Label:
+        # Metrics as getTextSize reports them, with symbols measured as a capital letter
+        (_, height), baseline = cv2.getTextSize(
+            ''.join(c if ord(c) < 128 else 'M' for c in text), self.font, scale, thickness)
+        # Generous canvas so glyphs that overshoot the cap height or baseline aren't clipped
+        above = height * 2 + thickness
+        below = height + baseline + thickness
+        runs = [self._render_run(run, scale, thickness, above, below) for run in self._split_runs(text)]
+        canvas = np.hstack(runs) if runs else np.zeros((above + below, 0), dtype=np.uint8)
+
+        rows = np.nonzero(canvas.any(axis=1))[0]
+        top, bottom = (rows[0], rows[-1] + 1) if len(rows) else (above, above)
+        return Label(np.ascontiguousarray(canvas[top:bottom]), above - top, canvas.shape[1], height, baseline)
+
+    @staticmethod
+    def _split_runs(text: str) -> List[str]:
+        """Split into runs that the Hershey font can draw and runs that it can't"""
+        runs: List[str] = []
+        for char in text:
+            ascii_char = ord(char) < 128
+            if runs and (ord(runs[-1][-1]) < 128) == ascii_char:
+                runs[-1] += char
+            else:
+                runs.append(char)
+        return runs
+
+    def _render_run(self, run: str, scale: float, thickness: int, above: int, below: int) -> np.ndarray:
+        if ord(run[0]) < 128:
+            return self._render_hershey(run, scale, thickness, above, below)
+
+        pillow = self._render_pillow(run, above, below) if self.unicode_font_path else None
+        if pillow is not None:
+            return pillow
+        return np.hstack([self._render_symbol(char, scale, thickness, above, below) for char in run])
+
+    def _render_hershey(self, text: str, scale: float, thickness: int, above: int, below: int) -> np.ndarray:
+        (width, _), _ = cv2.getTextSize(text, self.font, scale, thickness)
+        canvas = np.zeros((above + below, width), dtype=np.uint8)
+        # Same line type as the putText calls being replaced, so cached labels look identical
+        if self.line_type is None:
+            cv2.putText(canvas, text, (0, above), self.font, scale, 255, thickness)
+        else:
+            cv2.putText(canvas, text, (0, above), self.font, scale, 255, thickness, self.line_type)
+        return canvas
+
+    def _render_symbol(self, char: str, scale: float, thickness: int, above: int, below: int) -> np.ndarray:
+        if char not in ARROWS:
+            # Same placeholder putText would have drawn
+            return self._render_hershey('?', scale, thickness, above, below)
+
+        # Arrow fills a cap-height square on the baseline, with a little side bearing
+        (_, size), _ = cv2.getTextSize('M', self.font, scale, thickness)
+        pad = max(1, size // 5)
+        canvas = np.zeros((above + below, size + 2 * pad), dtype=np.uint8)
+        (sx, sy), (ex, ey) = ARROWS[char]
+        start = (pad + int(sx * (size - 1)), above - size + int(sy * (size - 1)))
+        end = (pad + int(ex * (size - 1)), above - size + int(ey * (size - 1)))
+        cv2.arrowedLine(canvas, start, end, 255, thickness, self.line_type or cv2.LINE_8, tipLength=0.4)
+        return canvas
+
+    def _render_pillow(self, run: str, above: int, below: int) -> Optional[np.ndarray]:
+        """Render through a TrueType font when Pillow and a font file are available"""
+        try:
+            from PIL import Image, ImageDraw, ImageFont
+            size = above // 2  # Roughly the Hershey cap height at this scale
+            font = self._pillow_fonts.get(size)
+            if font is None:
+                font = ImageFont.truetype(self.unicode_font_path, int(size * 1.4))
+                self._pillow_fonts[size] = font
+            left, _, right, _ = font.getbbox(run)
+            image = Image.new('L', (max(1, right - left), above + below))
+            # 'ls' puts the text baseline on the same row the Hershey runs use
+            ImageDraw.Draw(image).text((-left, above), run, fill=255, font=font, anchor='ls')
+            return np.asarray(image, dtype=np.uint8)
+        except Exception as e:
+            print(f"Error rendering text with {self.unicode_font_path}: {str(e)}")
+            self.unicode_font_path = None  # Don't retry every frame
+            return None
@@ -2,10 +2,14 @@ import cv2
 import numpy as np
 from typing import Optional, Tuple, List
 from config import UISettings
+from frame_result import FrameResult, Gesture
+from text_atlas import LabelAtlas
 import time
 import math
 
 class Particle:
+    __slots__ = ('pos', 'velocity', 'color', 'lifetime', 'age')
+
     def __init__(self, pos, velocity, color, lifetime):
         self.pos = np.array(pos, dtype=float)
         self.velocity = np.array(velocity, dtype=float)
@@ -13,15 +17,56 @@ class Particle:
         self.lifetime = lifetime
         self.age = 0
         
+class ScrollingGraph:
+    """Persistent graph canvas used as a ring buffer of columns.
+
+    Each push draws only the newest column, and blitting copies the canvas in two slices
+    starting at the oldest column, so the per-frame cost does not depend on history length.
+    """
+    SERIES = ('volume', 'brightness', 'fps', 'latency', 'confidence')
+
+    def __init__(self, width: int, height: int, colors: List[Tuple[int, int, int]]):
+        self.width = width
+        self.height = height
+        self.colors = [np.array(color, dtype=np.uint8) for color in colors]
+        self.canvas = np.zeros((height, width, 3), dtype=np.uint8)
+        self.head = 0  # Next column to write, which is also the oldest one on screen
+        self.last_y = [-1] * len(colors)
+
+    def push(self, values: Tuple[Optional[float], ...]):
+        column = self.canvas[:, self.head]
+        column[:] = 0
+        top = self.height - 1
+        for i, value in enumerate(values):
+            if value is None:
+                self.last_y[i] = -1  # Leave a gap rather than joining across missing samples
+                continue
+            y = top - int(min(1.0, max(0.0, value)) * top)
+            previous = self.last_y[i]
+            # A vertical run from the previous sample joins consecutive columns into a line
+            y0, y1 = (y, y) if previous < 0 else (min(y, previous), max(y, previous))
+            column[y0:y1 + 1] = self.colors[i]
+            self.last_y[i] = y
+        self.head = (self.head + 1) % self.width
+
+    def blit(self, frame: np.ndarray, x: int, y: int):
+        older = self.width - self.head
+        region = frame[y:y + self.height, x:x + self.width]
+        region[:, :older] = self.canvas[:, self.head:]
+        region[:, older:] = self.canvas[:, :self.head]
+
 class UIFeedback:
     def __init__(self, settings: UISettings):
         self.settings = settings
         self.font = cv2.FONT_HERSHEY_SIMPLEX
+        self.labels = LabelAtlas(self.font, unicode_font_path=self.settings.unicode_font_path)
         self.particles: List[Particle] = []
         self.hex_rotation = 0
         self.current_color = self.settings.color_scheme.base['default']
         self.target_color = self.current_color
-        self.data_points = []  # For real-time data visualization
+        graph = self.settings.graph_settings
+        self.graph = ScrollingGraph(graph.width, graph.height,
+                                    [graph.series_colors[name] for name in ScrollingGraph.SERIES])
         self.last_frame_time = time.time()
         
     def _update_timing(self):
@@ -31,16 +76,19 @@ class UIFeedback:
         return dt
 
     def draw_system_status(self, frame: np.ndarray, 
-                          gesture: Optional[str],
+                          result: FrameResult,
                           volume: Optional[float],
-                          brightness: Optional[float]):
+                          brightness: Optional[float],
+                          latency_ms: Optional[float] = None,
+                          capture_fps: Optional[float] = None,
+                          frame_age_ms: Optional[float] = None):
         try:
             dt = self._update_timing()
+            gesture = result.gesture
             
             # Update color based on gesture
             if gesture:
-                self.target_color = self.settings.color_scheme.base.get(
-                    gesture, self.settings.color_scheme.base['default'])
+                self.target_color = self.settings.color_scheme.palette[gesture]
             
             # Smooth color transition
             self.current_color = tuple(map(lambda x, y: int(x + (y - x) * 0.1),
@@ -63,10 +111,11 @@ class UIFeedback:
             self._draw_volume_control(overlay, volume)
             self._draw_brightness_control(overlay, brightness)
             self._draw_help_overlay(overlay)
+            self._draw_camera_status(overlay, capture_fps, frame_age_ms)
             
             # Draw data visualization
             if self.settings.show_data_vis:
-                self._update_data_visualization(volume, brightness)
+                self._update_data_visualization(volume, brightness, dt, result.confidence, latency_ms)
                 self._draw_data_visualization(overlay)
             
             # Apply overlay with transparency
@@ -155,9 +204,9 @@ class UIFeedback:
                       self.settings.animation_settings.particle_size,
                       color, -1)
 
-    def _add_gesture_particles(self, frame: np.ndarray, gesture: str):
+    def _add_gesture_particles(self, frame: np.ndarray, gesture: Gesture):
         h, w = frame.shape[:2]
-        color = self.settings.color_scheme.base[gesture]
+        color = self.settings.color_scheme.palette[gesture]
         
         for _ in range(10):  # Add burst of particles
             angle = np.random.uniform(0, 2*np.pi)
@@ -172,52 +221,55 @@ class UIFeedback:
             )
             self.particles.append(particle)
 
-    def _update_data_visualization(self, volume: Optional[float], brightness: Optional[float]):
-        if volume is not None and brightness is not None:
-            self.data_points.append((volume, brightness))
-            if len(self.data_points) > 100:  # Keep last 100 points
-                self.data_points.pop(0)
+    def _update_data_visualization(self, volume: Optional[float], brightness: Optional[float],
+                                   dt: float, confidence: float, latency_ms: Optional[float]):
+        graph = self.settings.graph_settings
+        fps = 1.0 / dt if dt > 0 else None
+        self.graph.push((
+            volume,
+            brightness,
+            fps / graph.fps_max if fps is not None else None,
+            latency_ms / graph.latency_max_ms if latency_ms is not None else None,
+            confidence,
+        ))
 
     def _draw_data_visualization(self, frame: np.ndarray):
-        if not self.data_points:
-            return
-            
         h, w = frame.shape[:2]
-        graph_w, graph_h = 200, 100
+        graph_w, graph_h = self.graph.width, self.graph.height
         graph_x, graph_y = w - graph_w - 20, h - graph_h - 20
-        
-        # Draw graph background
-        cv2.rectangle(frame, 
-                     (graph_x, graph_y), 
-                     (graph_x + graph_w, graph_y + graph_h),
-                     (0, 0, 0), -1)
+        if graph_x < 0 or graph_y < 0:
+            return
+
+        self.graph.blit(frame, graph_x, graph_y)
         cv2.rectangle(frame, 
                      (graph_x, graph_y), 
                      (graph_x + graph_w, graph_y + graph_h),
                      self.current_color, 1)
-        
-        # Draw data points
-        points = []
-        for i, (vol, _) in enumerate(self.data_points):
-            x = graph_x + (i * graph_w // 100)
-            y = graph_y + graph_h - int(vol * graph_h)
-            points.append((x, y))
-            
-        if len(points) > 1:
-            cv2.polylines(frame, [np.array(points)], False, 
-                         self.current_color, 1, 
-                         lineType=cv2.LINE_AA)
+
+    def _draw_camera_status(self, frame: np.ndarray, capture_fps: Optional[float],
+                            frame_age_ms: Optional[float]):
+        if capture_fps is None or frame_age_ms is None:
+            return
+        # Frame age is measured when the UI is drawn, so it covers capture-to-display latency
+        text = f"CAM {capture_fps:.0f} FPS  AGE {frame_age_ms:.0f} MS"
+        h, w = frame.shape[:2]
+        x = w - self.graph.width - 20
+        y = h - self.graph.height - 30
+        if x < 0 or y < 20:
+            return
+        # Changes nearly every frame, so putText is cheaper than a label atlas miss
+        cv2.putText(frame, text, (x, y), self.font, 0.5, self.settings.text_color, 1)
 
     def _add_glow_effect(self, frame: np.ndarray):
         blur = cv2.GaussianBlur(frame, (21, 21), 0)
         frame[:] = cv2.addWeighted(frame, 1.2, blur, -0.2, 0)
 
-    def _draw_gesture_info(self, frame: np.ndarray, gesture: Optional[str]):
-        gesture_text = f"GESTURE DETECTED: {gesture.upper() if gesture else 'NONE'}"
+    def _draw_gesture_info(self, frame: np.ndarray, gesture: Gesture):
+        gesture_text = f"GESTURE DETECTED: {gesture.label.upper()}"
         # Draw text background
-        text_size = cv2.getTextSize(gesture_text, self.font, 
-                                  self.settings.font_scale, 
-                                  self.settings.thickness)[0]
+        text_size = self.labels.text_size(gesture_text,
+                                          self.settings.font_scale,
+                                          self.settings.thickness)[0]
         cv2.rectangle(frame, (10, 10), 
                      (text_size[0] + 20, 45), 
                      (0, 0, 0), -1)
@@ -226,10 +278,10 @@ class UIFeedback:
                      self.settings.primary_color, 1)
         
         # Draw text
-        cv2.putText(frame, gesture_text, (15, 35), 
-                    self.font, self.settings.font_scale,
-                    self.settings.primary_color if gesture else self.settings.text_color,
-                    self.settings.thickness)
+        self.labels.draw(frame, gesture_text, (15, 35),
+                         self.settings.font_scale,
+                         self.settings.primary_color if gesture else self.settings.text_color,
+                         self.settings.thickness)
 
     def _draw_volume_control(self, frame: np.ndarray, volume: Optional[float]):
         if volume is not None:
@@ -248,8 +300,8 @@ class UIFeedback:
             text = f"VOL {int(volume * 100)}%"
             cv2.rectangle(frame, (40, 420), (95, 450), 
                          (0, 0, 0), -1)
-            cv2.putText(frame, text, (45, 440), 
-                       self.font, 0.5, self.settings.text_color, 1)
+            # Percentages change while a gesture is held; drawn directly rather than cached
+            cv2.putText(frame, text, (45, 440), self.font, 0.5, self.settings.text_color, 1)
 
     def _draw_brightness_control(self, frame: np.ndarray, brightness: Optional[float]):
         if brightness is not None:
@@ -269,8 +321,7 @@ class UIFeedback:
             text = f"BRT {int(brightness * 100)}%"
             cv2.rectangle(frame, (150, 90), (220, 120), 
                          (0, 0, 0), -1)
-            cv2.putText(frame, text, (155, 110), 
-                       self.font, 0.5, self.settings.text_color, 1)
+            cv2.putText(frame, text, (155, 110), self.font, 0.5, self.settings.text_color, 1)
 
     def _draw_help_overlay(self, frame: np.ndarray):
         help_text = [
@@ -298,9 +349,9 @@ class UIFeedback:
         y_offset = 160
         for i, text in enumerate(help_text):
             color = self.settings.secondary_color if i == 0 else self.settings.text_color
-            cv2.putText(frame, text,
-                       (w - panel_width, y_offset + i * 30),
-                       self.font, 0.5, color, 1)
+            self.labels.draw(frame, text,
+                             (w - panel_width, y_offset + i * 30),
+                             0.5, color, 1)
 
 
 